@@ -0,0 +1,58 @@
+"""Add composite indexes and unique marking constraint to attendance
+
+Revision ID: 3f9c2a7d41b8
+Revises: ebecf5ec62ab
+Create Date: 2026-10-17 10:12:31.482113
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2a7d41b8'
+down_revision = 'ebecf5ec62ab'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The unique constraint cannot be built over existing duplicates
+    if not context.is_offline_mode():
+        duplicates = op.get_bind().execute(sa.text(
+            "SELECT student_id, batch_id, date FROM attendance "
+            "GROUP BY student_id, batch_id, date HAVING count(*) > 1 LIMIT 5"
+        )).fetchall()
+        if duplicates:
+            raise RuntimeError(
+                "Duplicate attendance rows must be resolved before adding "
+                f"uq_attendance_student_batch_date, e.g. {[tuple(row) for row in duplicates]}"
+            )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_attendance_batch_id_date', 'attendance', ['batch_id', 'date'],
+            unique=False, postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_attendance_faculty_id_date', 'attendance', ['faculty_id', 'date'],
+            unique=False, postgresql_concurrently=True
+        )
+        # Also serves (student_id, batch_id) lookups through its leading columns
+        op.create_index(
+            'uq_attendance_student_batch_date', 'attendance', ['student_id', 'batch_id', 'date'],
+            unique=True, postgresql_concurrently=True
+        )
+
+    op.execute(
+        "ALTER TABLE attendance ADD CONSTRAINT uq_attendance_student_batch_date "
+        "UNIQUE USING INDEX uq_attendance_student_batch_date"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_attendance_student_batch_date', 'attendance', type_='unique')
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_attendance_faculty_id_date', table_name='attendance', postgresql_concurrently=True)
+        op.drop_index('ix_attendance_batch_id_date', table_name='attendance', postgresql_concurrently=True)
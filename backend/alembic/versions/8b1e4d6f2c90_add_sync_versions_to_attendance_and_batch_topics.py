@@ -0,0 +1,58 @@
+"""Add sync versions to attendance and batch_topics
+
+Revision ID: 8b1e4d6f2c90
+Revises: 3f9c2a7d41b8
+Create Date: 2026-10-17 11:40:05.913270
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1e4d6f2c90'
+down_revision = '3f9c2a7d41b8'
+branch_labels = None
+depends_on = None
+
+SYNC_TABLES = ('attendance', 'batch_topics')
+
+
+def upgrade() -> None:
+    # Rows carry the id of the transaction that last wrote them; clients use
+    # the snapshot xmin as their cursor, so out-of-order commits are never missed
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_sync_xid() RETURNS trigger AS $$
+        BEGIN
+            NEW.sync_xid := pg_current_xact_id()::text::bigint;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table in SYNC_TABLES:
+        op.add_column(table, sa.Column('sync_xid', sa.BigInteger(), nullable=True))
+        op.execute(f"UPDATE {table} SET sync_xid = pg_current_xact_id()::text::bigint")
+        op.execute(
+            f"CREATE TRIGGER {table}_set_sync_xid BEFORE INSERT OR UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION set_sync_xid()"
+        )
+
+    with op.get_context().autocommit_block():
+        for table in SYNC_TABLES:
+            op.create_index(
+                f'ix_{table}_batch_id_sync_xid', table, ['batch_id', 'sync_xid'],
+                unique=False, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in SYNC_TABLES:
+            op.drop_index(f'ix_{table}_batch_id_sync_xid', table_name=table, postgresql_concurrently=True)
+
+    for table in SYNC_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_set_sync_xid ON {table}")
+        op.drop_column(table, 'sync_xid')
+
+    op.execute("DROP FUNCTION IF EXISTS set_sync_xid()")
@@ -0,0 +1,47 @@
+"""Add notification feed indexes
+
+Revision ID: a7c15e93d2b4
+Revises: f2d84b1a9c63
+Create Date: 2026-10-17 18:24:09.913562
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c15e93d2b4'
+down_revision = 'f2d84b1a9c63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        # Keyset feed: WHERE user_id = ? AND (created_at, id) < (?, ?)
+        # ORDER BY created_at DESC, id DESC
+        op.create_index(
+            'ix_notifications_user_id_created_at_id', 'notifications',
+            ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False, postgresql_concurrently=True
+        )
+        # Unread feed and unread counts, a small fraction of all rows
+        op.create_index(
+            'ix_notifications_unread_user_id_created_at_id', 'notifications',
+            ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False, postgresql_concurrently=True,
+            postgresql_where=sa.text('is_read = false')
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_notifications_unread_user_id_created_at_id', table_name='notifications',
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'ix_notifications_user_id_created_at_id', table_name='notifications',
+            postgresql_concurrently=True
+        )
@@ -0,0 +1,135 @@
+"""Add attendance daily rollup
+
+Revision ID: c4a7e2b91d35
+Revises: 8b1e4d6f2c90
+Create Date: 2026-10-17 13:05:41.226804
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a7e2b91d35'
+down_revision = '8b1e4d6f2c90'
+branch_labels = None
+depends_on = None
+
+# Source of +1/-1 deltas for each triggering statement, read from the
+# statement's transition tables
+ROLLUP_DELTAS = {
+    'insert': "SELECT batch_id, date, status, 1 AS delta FROM new_rows",
+    # Only rows whose batch, date or status changed move between counts
+    'update': (
+        "SELECT n.batch_id, n.date, n.status, 1 AS delta "
+        "FROM new_rows n JOIN old_rows o ON o.id = n.id "
+        "WHERE (n.batch_id, n.date, n.status) IS DISTINCT FROM (o.batch_id, o.date, o.status) "
+        "UNION ALL "
+        "SELECT o.batch_id, o.date, o.status, -1 "
+        "FROM new_rows n JOIN old_rows o ON o.id = n.id "
+        "WHERE (n.batch_id, n.date, n.status) IS DISTINCT FROM (o.batch_id, o.date, o.status)"
+    ),
+    'delete': "SELECT batch_id, date, status, -1 AS delta FROM old_rows",
+}
+
+ROLLUP_FUNCTION = """
+    CREATE OR REPLACE FUNCTION attendance_rollup_{op}() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO attendance_daily_rollup AS r (
+            batch_id, center_id, date,
+            present_count, absent_count, late_count, excused_count,
+            created_at, updated_at
+        )
+        SELECT
+            c.batch_id, b.center_id, c.date,
+            coalesce(sum(c.delta) FILTER (WHERE c.status = 'PRESENT'), 0),
+            coalesce(sum(c.delta) FILTER (WHERE c.status = 'ABSENT'), 0),
+            coalesce(sum(c.delta) FILTER (WHERE c.status = 'LATE'), 0),
+            coalesce(sum(c.delta) FILTER (WHERE c.status = 'EXCUSED'), 0),
+            timezone('utc', now()), timezone('utc', now())
+        FROM ({deltas}) AS c
+        JOIN batches b ON b.id = c.batch_id
+        GROUP BY c.batch_id, b.center_id, c.date
+        ON CONFLICT (batch_id, date) DO UPDATE SET
+            present_count = r.present_count + EXCLUDED.present_count,
+            absent_count = r.absent_count + EXCLUDED.absent_count,
+            late_count = r.late_count + EXCLUDED.late_count,
+            excused_count = r.excused_count + EXCLUDED.excused_count,
+            updated_at = EXCLUDED.updated_at;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+ROLLUP_TRIGGER = """
+    CREATE TRIGGER attendance_rollup_{op} AFTER {event} ON attendance
+    REFERENCING {transition_tables}
+    FOR EACH STATEMENT EXECUTE FUNCTION attendance_rollup_{op}()
+"""
+
+TRANSITION_TABLES = {
+    'insert': "NEW TABLE AS new_rows",
+    'update': "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    'delete': "OLD TABLE AS old_rows",
+}
+
+BACKFILL = """
+    INSERT INTO attendance_daily_rollup (
+        batch_id, center_id, date,
+        present_count, absent_count, late_count, excused_count,
+        created_at, updated_at
+    )
+    SELECT
+        a.batch_id, b.center_id, a.date,
+        count(*) FILTER (WHERE a.status = 'PRESENT'),
+        count(*) FILTER (WHERE a.status = 'ABSENT'),
+        count(*) FILTER (WHERE a.status = 'LATE'),
+        count(*) FILTER (WHERE a.status = 'EXCUSED'),
+        timezone('utc', now()), timezone('utc', now())
+    FROM attendance a
+    JOIN batches b ON b.id = a.batch_id
+    GROUP BY a.batch_id, b.center_id, a.date
+"""
+
+
+def upgrade() -> None:
+    op.create_table('attendance_daily_rollup',
+    sa.Column('batch_id', sa.Integer(), nullable=False),
+    sa.Column('center_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('present_count', sa.Integer(), nullable=False),
+    sa.Column('absent_count', sa.Integer(), nullable=False),
+    sa.Column('late_count', sa.Integer(), nullable=False),
+    sa.Column('excused_count', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['batch_id'], ['batches.id'], ),
+    sa.ForeignKeyConstraint(['center_id'], ['centers.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('batch_id', 'date', name='uq_attendance_daily_rollup_batch_id_date')
+    )
+    op.create_index(op.f('ix_attendance_daily_rollup_id'), 'attendance_daily_rollup', ['id'], unique=False)
+    op.create_index('ix_attendance_daily_rollup_center_id_date', 'attendance_daily_rollup', ['center_id', 'date'], unique=False)
+
+    # Block attendance writes until the triggers exist so the backfill is exact
+    op.execute("LOCK TABLE attendance IN SHARE MODE")
+    op.execute(BACKFILL)
+
+    for trigger_op, deltas in ROLLUP_DELTAS.items():
+        op.execute(ROLLUP_FUNCTION.format(op=trigger_op, deltas=deltas))
+        op.execute(ROLLUP_TRIGGER.format(
+            op=trigger_op,
+            event=trigger_op.upper(),
+            transition_tables=TRANSITION_TABLES[trigger_op]
+        ))
+
+
+def downgrade() -> None:
+    for trigger_op in ROLLUP_DELTAS:
+        op.execute(f"DROP TRIGGER IF EXISTS attendance_rollup_{trigger_op} ON attendance")
+        op.execute(f"DROP FUNCTION IF EXISTS attendance_rollup_{trigger_op}()")
+
+    op.drop_index('ix_attendance_daily_rollup_center_id_date', table_name='attendance_daily_rollup')
+    op.drop_index(op.f('ix_attendance_daily_rollup_id'), table_name='attendance_daily_rollup')
+    op.drop_table('attendance_daily_rollup')
@@ -0,0 +1,100 @@
+"""Partition attendance by month
+
+Revision ID: d81f3a6c5e27
+Revises: c4a7e2b91d35
+Create Date: 2026-10-17 14:22:09.417552
+
+Rebuilds attendance as a table range-partitioned on date with one partition
+per month, plus a default partition for dates outside every monthly range.
+The rows are copied under an exclusive lock, so run this in a maintenance
+window. scripts/maintain_attendance_partitions.py then keeps future
+partitions created and archives old ones.
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81f3a6c5e27'
+down_revision = 'c4a7e2b91d35'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+ATTENDANCE_INDEXES = (
+    ('ix_attendance_id', ['id']),
+    ('ix_attendance_batch_id_date', ['batch_id', 'date']),
+    ('ix_attendance_faculty_id_date', ['faculty_id', 'date']),
+    ('ix_attendance_batch_id_sync_xid', ['batch_id', 'sync_xid']),
+)
+
+ATTENDANCE_TRIGGERS = (
+    "CREATE TRIGGER attendance_set_sync_xid BEFORE INSERT OR UPDATE ON attendance "
+    "FOR EACH ROW EXECUTE FUNCTION set_sync_xid()",
+    "CREATE TRIGGER attendance_rollup_insert AFTER INSERT ON attendance "
+    "REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION attendance_rollup_insert()",
+    "CREATE TRIGGER attendance_rollup_update AFTER UPDATE ON attendance "
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION attendance_rollup_update()",
+    "CREATE TRIGGER attendance_rollup_delete AFTER DELETE ON attendance "
+    "REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION attendance_rollup_delete()",
+)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def replace_attendance(create_statements: list, primary_key: list):
+    """Copy attendance into a new table and recreate its keys, indexes and triggers"""
+    op.execute("LOCK TABLE attendance IN ACCESS EXCLUSIVE MODE")
+    for statement in create_statements:
+        op.execute(statement)
+    op.execute("INSERT INTO attendance_new SELECT * FROM attendance")
+    op.execute("ALTER SEQUENCE attendance_id_seq OWNED BY attendance_new.id")
+    op.execute("DROP TABLE attendance")
+    op.execute("ALTER TABLE attendance_new RENAME TO attendance")
+
+    op.create_primary_key('attendance_pkey', 'attendance', primary_key)
+    op.create_unique_constraint(
+        'uq_attendance_student_batch_date', 'attendance', ['student_id', 'batch_id', 'date']
+    )
+    for name, columns in ATTENDANCE_INDEXES:
+        op.create_index(name, 'attendance', columns, unique=False)
+    op.create_foreign_key('attendance_batch_id_fkey', 'attendance', 'batches', ['batch_id'], ['id'])
+    op.create_foreign_key('attendance_faculty_id_fkey', 'attendance', 'faculty', ['faculty_id'], ['user_id'])
+    op.create_foreign_key('attendance_student_id_fkey', 'attendance', 'students', ['student_id'], ['user_id'])
+    for trigger in ATTENDANCE_TRIGGERS:
+        op.execute(trigger)
+
+
+def upgrade() -> None:
+    first_month = op.get_bind().execute(
+        sa.text("SELECT date_trunc('month', min(date))::date FROM attendance")
+    ).scalar()
+    current_month = date.today().replace(day=1)
+    month = min(first_month or current_month, current_month)
+
+    statements = ["CREATE TABLE attendance_new (LIKE attendance INCLUDING DEFAULTS) PARTITION BY RANGE (date)"]
+    while month <= add_months(current_month, MONTHS_AHEAD):
+        statements.append(
+            f"CREATE TABLE attendance_p{month:%Y_%m} PARTITION OF attendance_new "
+            f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+        )
+        month = add_months(month, 1)
+    statements.append("CREATE TABLE attendance_default PARTITION OF attendance_new DEFAULT")
+
+    # Partitions must exist before rows are copied in
+    replace_attendance(statements, ['id', 'date'])
+
+
+def downgrade() -> None:
+    # Rows in detached or archived partitions are not brought back
+    replace_attendance(["CREATE TABLE attendance_new (LIKE attendance INCLUDING DEFAULTS)"], ['id'])
@@ -0,0 +1,39 @@
+"""Add unique faculty performance period constraint
+
+Revision ID: e6a93c0d7f14
+Revises: d81f3a6c5e27
+Create Date: 2026-10-17 16:03:27.558190
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a93c0d7f14'
+down_revision = 'd81f3a6c5e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The nightly pipeline upserts one row per faculty member and period
+    if not context.is_offline_mode():
+        duplicates = op.get_bind().execute(sa.text(
+            "SELECT faculty_id, evaluation_period FROM faculty_performance "
+            "GROUP BY faculty_id, evaluation_period HAVING count(*) > 1 LIMIT 5"
+        )).fetchall()
+        if duplicates:
+            raise RuntimeError(
+                "Duplicate faculty_performance rows must be resolved before adding "
+                f"uq_faculty_performance_faculty_id_period, e.g. {[tuple(row) for row in duplicates]}"
+            )
+
+    op.create_unique_constraint(
+        'uq_faculty_performance_faculty_id_period', 'faculty_performance',
+        ['faculty_id', 'evaluation_period']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_faculty_performance_faculty_id_period', 'faculty_performance', type_='unique')
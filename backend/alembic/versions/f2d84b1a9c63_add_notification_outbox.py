@@ -0,0 +1,54 @@
+"""Add notification outbox
+
+Revision ID: f2d84b1a9c63
+Revises: e6a93c0d7f14
+Create Date: 2026-10-17 17:11:52.304719
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2d84b1a9c63'
+down_revision = 'e6a93c0d7f14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('notification_outbox',
+    sa.Column('audience', sa.Enum('USER', 'USERS', 'BATCH', 'CENTER', name='notificationaudience'), nullable=False),
+    sa.Column('audience_id', sa.Integer(), nullable=True),
+    sa.Column('audience_role', postgresql.ENUM('SUPER_ADMIN', 'CENTER_ADMIN', 'FACULTY', 'ACADEMIC_HEAD', 'STUDENT', name='userrole', create_type=False), nullable=True),
+    sa.Column('recipient_ids', postgresql.ARRAY(sa.Integer()), nullable=True),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('type', postgresql.ENUM('INFO', 'WARNING', 'ERROR', 'SUCCESS', name='notificationtype', create_type=False), nullable=False),
+    sa.Column('category', postgresql.ENUM('ATTENDANCE', 'PROGRESS', 'BATCH', 'FEEDBACK', 'SYSTEM', name='notificationcategory', create_type=False), nullable=False),
+    sa.Column('related_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'COMPLETED', 'FAILED', name='outboxstatus'), nullable=False),
+    sa.Column('last_user_id', sa.Integer(), nullable=False),
+    sa.Column('delivered_count', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_notification_outbox_id'), 'notification_outbox', ['id'], unique=False)
+    op.create_index(
+        'ix_notification_outbox_pending', 'notification_outbox', ['id'],
+        unique=False, postgresql_where=sa.text("status = 'PENDING'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_outbox_pending', table_name='notification_outbox')
+    op.drop_index(op.f('ix_notification_outbox_id'), table_name='notification_outbox')
+    op.drop_table('notification_outbox')
+    sa.Enum(name='outboxstatus').drop(op.get_bind(), checkfirst=False)
+    sa.Enum(name='notificationaudience').drop(op.get_bind(), checkfirst=False)
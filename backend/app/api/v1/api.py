@@ -18,4 +18,5 @@ api_router.include_router(subjects.router, prefix="/subjects", tags=["subjects"]
 api_router.include_router(batches.router, prefix="/batches", tags=["batches"])
 api_router.include_router(attendance.router, prefix="/attendance", tags=["attendance"])
 api_router.include_router(feedback.router, prefix="/feedback", tags=["feedback"])
-api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
\ No newline at end of file
+api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
+api_router.include_router(notifications.ws_router, prefix="/ws", tags=["notifications"])
\ No newline at end of file
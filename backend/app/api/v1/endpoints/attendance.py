@@ -0,0 +1,173 @@
+"""
+Attendance marking endpoints
+"""
+
+from datetime import date
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints.deps import get_db, get_current_user
+from app.core.exceptions import (
+    BatchNotFoundError,
+    CenterAccessDeniedError,
+    InsufficientPermissionsError,
+    ValidationError
+)
+from app.core.user_cache import CachedUser
+from app.models.batch import Batch
+from app.models.user import UserRole
+from app.schemas.attendance import (
+    DailyAttendanceSummary,
+    ExportFormat,
+    MonthlyAttendanceSummary,
+    SessionAttendanceRequest,
+    SessionAttendanceResponse
+)
+from app.schemas.sync import SyncRequest, SyncResponse
+from app.services import (
+    attendance_export_service,
+    attendance_rollup_service,
+    attendance_service,
+    sync_service
+)
+
+router = APIRouter()
+
+ATTENDANCE_ADMIN_ROLES = [UserRole.SUPER_ADMIN, UserRole.CENTER_ADMIN, UserRole.ACADEMIC_HEAD]
+
+EXPORT_FORMATS = {
+    ExportFormat.CSV: ("text/csv; charset=utf-8", attendance_export_service.iter_csv),
+    ExportFormat.XLSX: (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        attendance_export_service.iter_xlsx
+    ),
+}
+
+
+@router.post(
+    "/batches/{batch_id}/sessions/{session_date}",
+    response_model=SessionAttendanceResponse
+)
+def mark_session_attendance(
+    batch_id: int,
+    session_date: date,
+    attendance_data: SessionAttendanceRequest,
+    current_user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Mark attendance for a batch's whole roster in one request
+    """
+    batch = db.get(Batch, batch_id)
+    if batch is None:
+        raise BatchNotFoundError(batch_id)
+
+    if not current_user.can_access_center(batch.center_id):
+        raise CenterAccessDeniedError(batch.center_id)
+
+    if current_user.role == UserRole.FACULTY:
+        if batch.faculty_id != current_user.id:
+            raise InsufficientPermissionsError("batch faculty")
+        faculty_id = current_user.id
+    elif current_user.role in ATTENDANCE_ADMIN_ROLES:
+        faculty_id = batch.faculty_id
+    else:
+        raise InsufficientPermissionsError("faculty or admin")
+
+    result = attendance_service.mark_session_attendance(
+        db,
+        batch,
+        session_date,
+        attendance_data.entries,
+        faculty_id=faculty_id,
+        topic_covered=attendance_data.topic_covered,
+        restrict_to_faculty=current_user.role == UserRole.FACULTY
+    )
+    db.commit()
+    return result
+
+
+
+@router.post("/sync", response_model=SyncResponse)
+def sync_attendance(
+    sync_data: SyncRequest,
+    current_user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Push offline attendance and topic progress edits and pull server changes
+    """
+    if current_user.role != UserRole.FACULTY and current_user.role not in ATTENDANCE_ADMIN_ROLES:
+        raise InsufficientPermissionsError("faculty or admin")
+
+    return sync_service.synchronize(db, current_user, sync_data)
+
+
+@router.get("/centers/{center_id}/daily", response_model=List[DailyAttendanceSummary])
+def get_center_daily_attendance(
+    center_id: int,
+    start_date: date,
+    end_date: date,
+    batch_ids: Optional[List[int]] = Query(None),
+    current_user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Get attendance counts per day for a center from the daily rollup
+    """
+    if not current_user.can_access_center(center_id):
+        raise CenterAccessDeniedError(center_id)
+    if start_date > end_date:
+        raise ValidationError("start_date must not be after end_date")
+
+    return attendance_rollup_service.get_daily_attendance(
+        db, center_id, (start_date, end_date), batch_ids
+    )
+
+
+@router.get("/centers/{center_id}/monthly", response_model=List[MonthlyAttendanceSummary])
+def get_center_monthly_attendance(
+    center_id: int,
+    year: int = Query(..., ge=2000, le=2100),
+    current_user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Get attendance counts per month for a center from the daily rollup
+    """
+    if not current_user.can_access_center(center_id):
+        raise CenterAccessDeniedError(center_id)
+
+    return attendance_rollup_service.get_monthly_attendance(db, center_id, year)
+
+
+@router.get("/centers/{center_id}/export")
+def export_center_attendance(
+    center_id: int,
+    start_date: date,
+    end_date: date,
+    format: ExportFormat = ExportFormat.CSV,
+    batch_ids: Optional[List[int]] = Query(None),
+    current_user: CachedUser = Depends(get_current_user)
+) -> Any:
+    """
+    Stream a center's attendance register as CSV or XLSX
+    """
+    if current_user.role not in ATTENDANCE_ADMIN_ROLES:
+        raise InsufficientPermissionsError("admin")
+    if not current_user.can_access_center(center_id):
+        raise CenterAccessDeniedError(center_id)
+    if start_date > end_date:
+        raise ValidationError("start_date must not be after end_date")
+
+    media_type, iter_rows = EXPORT_FORMATS[format]
+    filename = f"attendance_center_{center_id}_{start_date}_{end_date}.{format.value}"
+    # The stream opens its own session; it outlives the request dependencies
+    return StreamingResponse(
+        iter_rows(center_id, (start_date, end_date), batch_ids),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
\ No newline at end of file
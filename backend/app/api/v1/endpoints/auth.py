@@ -3,20 +3,23 @@ Authentication endpoints for user login, registration, and token management
 """
 
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.v1.endpoints.deps import get_db, get_current_user
+from app.api.v1.endpoints.deps import get_async_db, get_current_user, oauth2_scheme
 from app.core.security import (
     create_access_token,
     create_refresh_token,
-    verify_token,
-    get_password_hash,
-    verify_password
+    create_password_reset_token,
+    decode_token,
+    verify_password_reset_token,
+    password_hasher
 )
+from app.core.token_revocation import token_revocation
 from app.core.exceptions import (
     AuthenticationError,
     ValidationError,
@@ -27,14 +30,15 @@ from app.core.exceptions import (
 from app.models.user import User, UserRole
 from app.schemas.auth import Token, TokenRefresh, UserCreate, UserResponse
 from app.core.utils import validate_email, validate_password_strength
+from app.core.user_cache import CachedUser
 
 router = APIRouter()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Register a new user
@@ -49,12 +53,13 @@ def register(
         raise ValidationError(f"Weak password: {', '.join(password_validation['errors'])}")
     
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    existing_user = result.scalar_one_or_none()
     if existing_user:
         raise EmailAlreadyExistsError(user_data.email)
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     db_user = User(
         email=user_data.email,
         password_hash=hashed_password,
@@ -66,23 +71,24 @@ def register(
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return UserResponse.from_orm(db_user)
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Authenticate user and return access token
     """
     # Authenticate user
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+    result = await db.execute(select(User).where(User.email == form_data.username))
+    user = result.scalar_one_or_none()
+    if not user or not await password_hasher.verify(form_data.password, user.password_hash):
         raise AuthenticationError("Incorrect email or password")
     
     if not user.is_active():
@@ -93,18 +99,18 @@ def login(
     refresh_token_expires = timedelta(days=7)
     
     access_token = create_access_token(
-        data={"sub": str(user.id), "role": user.role},
+        user.id,
         expires_delta=access_token_expires
     )
     
     refresh_token = create_refresh_token(
-        data={"sub": str(user.id)},
+        user.id,
         expires_delta=refresh_token_expires
     )
     
     # Update last login
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     return {
         "access_token": access_token,
@@ -116,26 +122,32 @@ def login(
 
 
 @router.post("/refresh", response_model=TokenRefresh)
-def refresh_token(
+async def refresh_token(
     refresh_token: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Refresh access token using refresh token
     """
     try:
         # Verify refresh token
-        user_id = verify_token(refresh_token, "refresh")
+        payload = decode_token(refresh_token)
+        if not payload or payload.get("type") != "refresh" or payload.get("sub") is None:
+            raise AuthenticationError("Invalid or expired refresh token")
+        
+        user_id = int(payload["sub"])
+        if await token_revocation.is_revoked(user_id, payload.get("jti"), payload.get("iat")):
+            raise AuthenticationError("Invalid or expired refresh token")
         
         # Get user
-        user = db.query(User).filter(User.id == int(user_id)).first()
+        user = await db.get(User, user_id)
         if not user or not user.is_active():
             raise AuthenticationError("Invalid or expired refresh token")
         
         # Create new access token
         access_token_expires = timedelta(minutes=30)
         new_access_token = create_access_token(
-            data={"sub": str(user.id), "role": user.role},
+            user.id,
             expires_delta=access_token_expires
         )
         
@@ -150,25 +162,40 @@ def refresh_token(
 
 
 @router.post("/logout")
-def logout(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def logout(
+    refresh_token: Optional[str] = None,
+    token: str = Depends(oauth2_scheme),
+    current_user: CachedUser = Depends(get_current_user)
 ) -> Any:
     """
     Logout user (invalidate tokens)
+    
+    Pass the session's refresh token so it cannot be used to obtain new
+    access tokens after logout.
     """
-    # In a real implementation, you would:
-    # 1. Add the token to a blacklist in Redis
-    # 2. Or use JWT token revocation
-    # For now, we'll just return success
+    # Revoke this access token until it would have expired
+    payload = decode_token(token)
+    if payload and payload.get("jti"):
+        await token_revocation.revoke_token(payload["jti"], int(payload["exp"]))
+    
+    if refresh_token:
+        refresh_payload = decode_token(refresh_token)
+        if (
+            not refresh_payload
+            or refresh_payload.get("type") != "refresh"
+            or refresh_payload.get("sub") != str(current_user.id)
+            or not refresh_payload.get("jti")
+        ):
+            raise AuthenticationError("Invalid or expired refresh token")
+        await token_revocation.revoke_token(refresh_payload["jti"], int(refresh_payload["exp"]))
     
     return {"message": "Successfully logged out"}
 
 
 @router.post("/reset-password-request")
-def reset_password_request(
+async def reset_password_request(
     email: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Request password reset
@@ -178,7 +205,8 @@ def reset_password_request(
         raise ValidationError("Invalid email format")
     
     # Check if user exists
-    user = db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalar_one_or_none()
     if not user:
         # Don't reveal if email exists or not
         return {"message": "If the email exists, a reset link has been sent"}
@@ -193,10 +221,10 @@ def reset_password_request(
 
 
 @router.post("/reset-password")
-def reset_password(
+async def reset_password(
     token: str,
     new_password: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Reset password using token
@@ -211,13 +239,17 @@ def reset_password(
             raise ValidationError(f"Weak password: {', '.join(password_validation['errors'])}")
         
         # Get user
-        user = db.query(User).filter(User.email == email).first()
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalar_one_or_none()
         if not user:
             raise AuthenticationError("Invalid or expired reset token")
         
         # Update password
-        user.password_hash = get_password_hash(new_password)
-        db.commit()
+        user.password_hash = await password_hasher.hash(new_password)
+        await db.commit()
+        
+        # Invalidate every token issued with the old password
+        await token_revocation.revoke_user(user.id)
         
         return {"message": "Password reset successfully"}
         
@@ -226,10 +258,12 @@ def reset_password(
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+async def get_current_user_info(
+    current_user: CachedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Get current user information
     """
-    return UserResponse.from_orm(current_user)
\ No newline at end of file
+    user = await db.get(User, current_user.id)
+    return UserResponse.from_orm(user)
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Batch management endpoints
+"""
+
+from datetime import date
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints.deps import get_db, get_current_user
+from app.core.exceptions import BatchNotFoundError, ValidationError
+from app.core.user_cache import CachedUser
+from app.models.batch import Batch
+from app.models.user import UserRole
+from app.schemas.batch import BatchAnalytics
+from app.services import analytics_service
+
+router = APIRouter()
+
+
+def _accessible_batch_ids(db: Session, batch_ids: List[int], current_user: CachedUser) -> List[int]:
+    """Filter batch ids down to those the user may see"""
+    query = db.query(Batch.id).filter(Batch.id.in_(batch_ids))
+    if current_user.role != UserRole.SUPER_ADMIN:
+        query = query.filter(Batch.center_id == current_user.center_id)
+    accessible = {batch_id for (batch_id,) in query}
+    return [batch_id for batch_id in batch_ids if batch_id in accessible]
+
+
+def _date_range(start_date: Optional[date], end_date: Optional[date]):
+    if start_date is None and end_date is None:
+        return None
+    if start_date is None or end_date is None:
+        raise ValidationError("Both start_date and end_date are required for a date range")
+    return start_date, end_date
+
+
+@router.get("/analytics", response_model=List[BatchAnalytics])
+def get_batches_analytics(
+    batch_ids: List[int] = Query(...),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Get analytics for several batches at once
+    """
+    batch_ids = _accessible_batch_ids(db, list(dict.fromkeys(batch_ids)), current_user)
+    analytics = analytics_service.get_batch_analytics(
+        db, batch_ids, _date_range(start_date, end_date)
+    )
+    return [analytics[batch_id] for batch_id in batch_ids]
+
+
+@router.get("/{batch_id}/analytics", response_model=BatchAnalytics)
+def get_batch_analytics(
+    batch_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Get analytics for a batch
+    """
+    if not _accessible_batch_ids(db, [batch_id], current_user):
+        raise BatchNotFoundError(batch_id)
+    analytics = analytics_service.get_batch_analytics(
+        db, [batch_id], _date_range(start_date, end_date)
+    )
+    return analytics[batch_id]
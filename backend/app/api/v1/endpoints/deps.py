@@ -2,17 +2,19 @@
 Dependencies for API endpoints
 """
 
-from typing import Generator
+from typing import Generator, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import settings
-from app.database import get_db
-from app.models.user import User
+from app.database import AsyncSessionLocal, get_db, get_async_db
+from app.models.user import User, UserRole
 from app.core.exceptions import AuthenticationError, AuthorizationError
+from app.core.user_cache import CachedUser, user_cache
+from app.core.token_revocation import token_revocation
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(
@@ -21,12 +23,15 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> CachedUser:
     """
     Get current user from JWT token
+
+    Returns the cached authorization view of the user; endpoints that need
+    the full profile should load the User row themselves.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,26 +40,64 @@ def get_current_user(
     )
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if user is None:
+    if await token_revocation.is_revoked(int(user_id), payload.get("jti"), payload.get("iat")):
         raise credentials_exception
     
+    user = await user_cache.get(int(user_id))
+    if user is None:
+        db_user = await db.get(User, int(user_id))
+        if db_user is None:
+            raise credentials_exception
+        user = CachedUser.from_user(db_user)
+        await user_cache.set(user)
+    
     if not user.is_active():
         raise AuthenticationError("Account is inactive")
     
     return user
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def get_websocket_user(token: str) -> Optional[CachedUser]:
+    """
+    Authenticate a WebSocket client from its access token
+
+    Browsers cannot set headers on WebSocket requests, so the token arrives
+    as a query parameter. Returns None instead of raising; the caller closes
+    the socket. A database session is only opened on a user cache miss.
+    """
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    user_id = payload.get("sub")
+    if user_id is None or payload.get("type") != "access":
+        return None
+
+    if await token_revocation.is_revoked(int(user_id), payload.get("jti"), payload.get("iat")):
+        return None
+
+    user = await user_cache.get(int(user_id))
+    if user is None:
+        async with AsyncSessionLocal() as db:
+            db_user = await db.get(User, int(user_id))
+        if db_user is None:
+            return None
+        user = CachedUser.from_user(db_user)
+        await user_cache.set(user)
+
+    return user if user.is_active() else None
+
+
+async def get_current_active_user(
+    current_user: CachedUser = Depends(get_current_user)
+) -> CachedUser:
     """
     Get current active user (additional check for active status)
     """
@@ -67,7 +110,7 @@ def get_current_user_with_role(required_role: str):
     """
     Get current user with required role check
     """
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    async def role_checker(current_user: CachedUser = Depends(get_current_user)) -> CachedUser:
         if current_user.role != required_role:
             raise AuthorizationError(f"Requires {required_role} role")
         return current_user
@@ -75,9 +118,9 @@ def get_current_user_with_role(required_role: str):
     return role_checker
 
 
-def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def get_current_admin_user(
+    current_user: CachedUser = Depends(get_current_user)
+) -> CachedUser:
     """
     Get current admin user (super_admin or center_admin)
     """
@@ -86,9 +129,9 @@ def get_current_admin_user(
     return current_user
 
 
-def get_current_super_admin(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def get_current_super_admin(
+    current_user: CachedUser = Depends(get_current_user)
+) -> CachedUser:
     """
     Get current super admin user
     """
@@ -0,0 +1,54 @@
+"""
+Faculty management endpoints
+"""
+
+from typing import Any, List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints.deps import get_db, get_current_user
+from app.core.exceptions import FacultyNotFoundError
+from app.core.user_cache import CachedUser
+from app.models.user import User, UserRole
+from app.schemas.faculty import FacultyStats
+from app.services import faculty_stats_service
+
+router = APIRouter()
+
+
+def _accessible_faculty_ids(db: Session, faculty_ids: List[int], current_user: CachedUser) -> List[int]:
+    """Filter faculty ids down to those the user may see"""
+    query = db.query(User.id).filter(User.id.in_(faculty_ids), User.role == UserRole.FACULTY)
+    if current_user.role != UserRole.SUPER_ADMIN:
+        query = query.filter(User.center_id == current_user.center_id)
+    accessible = {faculty_id for (faculty_id,) in query}
+    return [faculty_id for faculty_id in faculty_ids if faculty_id in accessible]
+
+
+@router.get("/stats", response_model=List[FacultyStats])
+def get_faculty_list_stats(
+    faculty_ids: List[int] = Query(...),
+    current_user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Get aggregate statistics for a page of faculty members at once
+    """
+    faculty_ids = _accessible_faculty_ids(db, list(dict.fromkeys(faculty_ids)), current_user)
+    stats = faculty_stats_service.get_faculty_stats(db, faculty_ids)
+    return [stats[faculty_id] for faculty_id in faculty_ids]
+
+
+@router.get("/{faculty_id}/stats", response_model=FacultyStats)
+def get_faculty_member_stats(
+    faculty_id: int,
+    current_user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Get aggregate statistics for a faculty member
+    """
+    if not _accessible_faculty_ids(db, [faculty_id], current_user):
+        raise FacultyNotFoundError(faculty_id)
+    return faculty_stats_service.get_faculty_member_stats(db, faculty_id)
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Notification endpoints
+"""
+
+from typing import Any, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Query, WebSocket, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.v1.endpoints.deps import get_db, get_current_user, get_websocket_user
+from app.config import settings
+from app.core.notification_hub import NotificationConnection, notification_hub
+from app.core.user_cache import CachedUser
+from app.core.utils import create_keyset_params, encode_keyset_cursor
+from app.database import SessionLocal
+from app.models.notification import NotificationCategory
+from app.schemas.notification import NotificationFeed, NotificationResponse, UnreadCount
+from app.services import notification_counter_service, notification_service
+
+router = APIRouter()
+ws_router = APIRouter()
+
+
+def _load_missed_notifications(user_id: int, last_id: int) -> Tuple[List[dict], bool]:
+    """Catch-up payloads after last_id, and whether more were left out"""
+    db = SessionLocal()
+    try:
+        notifications = notification_service.get_missed_notifications(
+            db, user_id, last_id, settings.NOTIFICATION_CATCHUP_LIMIT + 1
+        )
+    finally:
+        db.close()
+    truncated = len(notifications) > settings.NOTIFICATION_CATCHUP_LIMIT
+    return [
+        notification_service.to_push_data(notification)
+        for notification in notifications[:settings.NOTIFICATION_CATCHUP_LIMIT]
+    ], truncated
+
+
+@router.get("", response_model=NotificationFeed)
+def get_notifications(
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    unread_only: bool = False,
+    category: Optional[NotificationCategory] = None,
+    current_user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Get the current user's notifications, newest first
+
+    Pass the returned next_cursor to fetch the following page.
+    """
+    params = create_keyset_params(cursor, limit)
+    notifications, next_key = notification_service.get_feed(
+        db, current_user.id, params["limit"], params["after"], unread_only, category
+    )
+    return {
+        "items": notifications,
+        "next_cursor": encode_keyset_cursor(*next_key) if next_key else None
+    }
+
+
+@router.get("/unread-count", response_model=UnreadCount)
+def get_unread_count(
+    current_user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Get the current user's unread notification counts
+    """
+    counts = notification_counter_service.get_unread_counts(db, current_user.id)
+    total = counts.pop(notification_counter_service.TOTAL_FIELD)
+    return {"total": total, "by_category": counts}
+
+
+@router.post("/read-all")
+def mark_all_notifications_as_read(
+    category: Optional[NotificationCategory] = None,
+    current_user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Mark all of the current user's notifications as read
+    """
+    updated = notification_service.mark_all_as_read(db, current_user.id, category)
+    db.commit()
+    return {"updated": updated}
+
+
+@router.post("/{notification_id}/read", response_model=NotificationResponse)
+def mark_notification_as_read(
+    notification_id: int,
+    current_user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Mark a notification as read
+    """
+    notification = notification_service.get_user_notification(db, notification_id, current_user.id)
+    if not notification.is_read:
+        notification.mark_as_read()
+        db.commit()
+    return notification
+
+
+@router.post("/{notification_id}/unread", response_model=NotificationResponse)
+def mark_notification_as_unread(
+    notification_id: int,
+    current_user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Mark a notification as unread
+    """
+    notification = notification_service.get_user_notification(db, notification_id, current_user.id)
+    if notification.is_read:
+        notification.mark_as_unread()
+        db.commit()
+    return notification
+
+
+@ws_router.websocket("/notifications")
+async def notifications_socket(
+    websocket: WebSocket,
+    token: str = Query(...),
+    last_id: Optional[int] = Query(None, ge=0)
+):
+    """
+    Push new notifications to the client as they are created
+
+    Messages are JSON objects with an "event" key: "notification" (payload
+    in "data"), "ping" (answer with any message) and "resync" (more was
+    missed than catch-up sends; reload the feed). Pass the id of the last
+    notification seen as last_id to receive what was missed while
+    disconnected.
+    """
+    user = await get_websocket_user(token)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    connection = NotificationConnection(websocket, user.id, settings.WS_SEND_QUEUE_SIZE)
+    # Register before catch-up so nothing committed in between is missed;
+    # live copies of caught-up notifications are skipped
+    notification_hub.register(connection)
+    try:
+        sent_ids = set()
+        if last_id is not None:
+            missed, truncated = await run_in_threadpool(_load_missed_notifications, user.id, last_id)
+            if truncated:
+                await connection.send({"event": "resync"})
+            for data in missed:
+                if not await connection.send({"event": "notification", "data": data}):
+                    return
+                sent_ids.add(data["id"])
+
+        await connection.serve(settings.WS_HEARTBEAT_INTERVAL, sent_ids)
+    finally:
+        notification_hub.unregister(connection)
\ No newline at end of file
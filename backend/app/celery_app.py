@@ -0,0 +1,44 @@
+"""
+Celery application and beat schedule for background jobs
+
+    celery -A app.celery_app worker --loglevel=info
+    celery -A app.celery_app beat --loglevel=info
+"""
+
+from celery import Celery
+from celery.schedules import crontab
+
+from app.config import settings
+
+celery_app = Celery(
+    "lms",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.tasks.faculty_performance", "app.tasks.notifications"]
+)
+
+celery_app.conf.update(
+    timezone="UTC",
+    # Re-deliver a task if its worker dies mid-run; tasks are idempotent
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    beat_schedule={
+        "generate-faculty-performance": {
+            "task": "app.tasks.faculty_performance.generate_faculty_performance",
+            "schedule": crontab(hour=settings.FACULTY_PERFORMANCE_HOUR, minute=0),
+        },
+        "process-notification-outbox": {
+            "task": "app.tasks.notifications.process_notification_outbox",
+            "schedule": settings.NOTIFICATION_OUTBOX_POLL_SECONDS,
+        },
+        "reconcile-unread-counters": {
+            "task": "app.tasks.notifications.reconcile_unread_counters",
+            "schedule": settings.NOTIFICATION_UNREAD_RECONCILE_SECONDS,
+        },
+        "purge-read-notifications": {
+            "task": "app.tasks.notifications.purge_read_notifications",
+            "schedule": crontab(hour=settings.NOTIFICATION_RETENTION_HOUR, minute=0),
+        },
+    },
+)
@@ -15,12 +15,14 @@ class CustomException(Exception):
         message: str,
         status_code: int = 500,
         error_code: str = "INTERNAL_ERROR",
-        details: Optional[Dict[str, Any]] = None
+        details: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
     ):
         self.message = message
         self.status_code = status_code
         self.error_code = error_code
         self.details = details or {}
+        self.headers = headers
         super().__init__(self.message)
 
 
@@ -132,6 +134,24 @@ class RateLimitError(CustomException):
         )
 
 
+class ServiceUnavailableError(CustomException):
+    """Temporary overload errors"""
+    
+    def __init__(
+        self,
+        message: str = "Service temporarily unavailable",
+        retry_after: int = 1,
+        details: Optional[Dict[str, Any]] = None
+    ):
+        super().__init__(
+            message=message,
+            status_code=503,
+            error_code="SERVICE_UNAVAILABLE",
+            details=details,
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
 class FileUploadError(CustomException):
     """File upload related errors"""
     
@@ -0,0 +1,147 @@
+"""
+Prometheus metrics for requests, database and Redis usage
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+from sqlalchemy import event
+
+from app.core.security import password_hasher
+from app.database import async_engine, engine, get_pool_status, redis_binary_client, redis_client
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"]
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being processed"
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duration of individual SQL statements"
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Total SQL execution time per HTTP request",
+    ["route"]
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+)
+REDIS_ERRORS = Counter(
+    "redis_command_errors_total",
+    "Redis commands that raised an error",
+    ["command"]
+)
+
+
+class RequestQueryStats:
+    """
+    SQL statement counters for the current request
+    """
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+_request_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def start_request_query_stats() -> RequestQueryStats:
+    """Begin counting SQL statements for the current request"""
+    stats = RequestQueryStats()
+    _request_query_stats.set(stats)
+    return stats
+
+
+def observe_request(method: str, route: str, status_code: int, duration: float, stats: RequestQueryStats):
+    """Record metrics for a completed request"""
+    REQUEST_LATENCY.labels(method, route, str(status_code)).observe(duration)
+    DB_QUERIES_PER_REQUEST.labels(route).observe(stats.count)
+    DB_TIME_PER_REQUEST.labels(route).observe(stats.duration)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+    DB_QUERY_DURATION.observe(duration)
+
+    stats = _request_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += duration
+
+
+def _handle_error(exception_context):
+    # Keep the start-time stack balanced when a statement fails
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
+
+
+def instrument_engine(target_engine):
+    """Attach SQL timing listeners to an engine"""
+    event.listen(target_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(target_engine, "handle_error", _handle_error)
+
+
+def instrument_redis(client):
+    """Time every command issued through a Redis client"""
+    execute_command = client.execute_command
+
+    def timed_execute_command(*args, **options):
+        command = str(args[0]).upper() if args else "UNKNOWN"
+        start_time = time.perf_counter()
+        try:
+            return execute_command(*args, **options)
+        except Exception:
+            REDIS_ERRORS.labels(command).inc()
+            raise
+        finally:
+            REDIS_COMMAND_DURATION.labels(command).observe(time.perf_counter() - start_time)
+
+    client.execute_command = timed_execute_command
+
+
+class PoolCollector:
+    """
+    Report connection pool and password hasher state at scrape time
+    """
+
+    def collect(self):
+        for key, value in get_pool_status().items():
+            if isinstance(value, (int, float)):
+                yield GaugeMetricFamily(f"db_pool_{key}", f"Database pool {key.replace('_', ' ')}", value=value)
+
+        for key, value in password_hasher.stats().items():
+            yield GaugeMetricFamily(f"password_hasher_{key}", f"Password hasher {key.replace('_', ' ')}", value=value)
+
+
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+instrument_redis(redis_client)
+instrument_redis(redis_binary_client)
+REGISTRY.register(PoolCollector())
@@ -0,0 +1,221 @@
+"""
+Real-time notification push over WebSocket
+
+Notification writers publish to a single Redis channel after commit. Each
+application worker holds one pub/sub subscription to that channel and
+routes every message to the sockets of the recipients connected to that
+worker, so the number of Redis subscriptions does not grow with the number
+of clients.
+
+A published message carries the shared notification fields once and a
+list of [notification id, user id] recipients:
+
+    {"title": ..., "message": ..., "type": ..., "category": ...,
+     "related_id": ..., "created_at": ..., "recipients": [[id, user_id], ...]}
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+import redis
+import redis.asyncio as aioredis
+from starlette.websockets import WebSocket, WebSocketState
+
+from app.config import settings
+from app.database import redis_client
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "notifications:events"
+
+# Close codes (RFC 6455 section 7.4 and the IANA registry)
+CLOSE_GOING_AWAY = 1001
+CLOSE_SERVICE_RESTART = 1012
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+def publish(messages: Iterable[dict]):
+    """Publish committed notifications to every worker"""
+    messages = list(messages)
+    if not messages:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for message in messages:
+            pipe.publish(CHANNEL, json.dumps(message, default=str))
+        pipe.execute()
+    except redis.RedisError as e:
+        # Clients pick the notifications up through catch-up on reconnect
+        logger.warning(f"Notification publish failed: {e}")
+
+
+class NotificationConnection:
+    """
+    One client socket with a bounded outgoing queue
+    """
+
+    def __init__(self, websocket: WebSocket, user_id: int, queue_size: int):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=queue_size)
+        self.close_code: Optional[int] = None
+
+    def push(self, notification: dict):
+        """Queue a notification, dropping the client if it cannot keep up"""
+        if self.close_code is not None:
+            return
+        try:
+            self.queue.put_nowait(notification)
+        except asyncio.QueueFull:
+            # Reconnecting with last_id is cheaper than buffering without bound
+            self.close(CLOSE_TRY_AGAIN_LATER)
+
+    def close(self, code: int):
+        """Ask the connection's send loop to close the socket"""
+        if self.close_code is None:
+            self.close_code = code
+            try:
+                self.queue.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
+
+    async def serve(self, heartbeat_interval: int, skip_ids: Set[int]):
+        """
+        Forward queued notifications until the client leaves or the
+        connection is closed. Sends a ping after each idle heartbeat
+        interval and drops clients silent for two intervals; any client
+        message counts as a heartbeat. Notifications in skip_ids were
+        already sent by catch-up.
+        """
+        loop = asyncio.get_running_loop()
+        last_seen = loop.time()
+
+        async def receive():
+            nonlocal last_seen
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                last_seen = loop.time()
+
+        receiver = asyncio.create_task(receive())
+        getter = None
+        try:
+            while True:
+                if getter is None:
+                    getter = asyncio.ensure_future(self.queue.get())
+                done, _ = await asyncio.wait(
+                    {getter, receiver}, timeout=heartbeat_interval,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if receiver in done:
+                    return
+
+                if getter in done:
+                    notification, getter = getter.result(), None
+                    if notification is None:
+                        break
+                    if notification["id"] in skip_ids:
+                        continue
+                    if not await self.send({"event": "notification", "data": notification}):
+                        return
+                    continue
+
+                if loop.time() - last_seen > 2 * heartbeat_interval:
+                    self.close(CLOSE_GOING_AWAY)
+                    break
+                if not await self.send({"event": "ping"}):
+                    return
+        finally:
+            for task in (getter, receiver):
+                if task is not None:
+                    task.cancel()
+
+        if self.websocket.client_state == WebSocketState.CONNECTED:
+            await self.websocket.close(code=self.close_code)
+
+    async def send(self, message: dict) -> bool:
+        """Send a JSON message, returning False once the socket is gone"""
+        if self.websocket.client_state != WebSocketState.CONNECTED:
+            return False
+        try:
+            await self.websocket.send_json(message)
+        except Exception:
+            return False
+        return True
+
+
+class NotificationHub:
+    """
+    Per-worker registry of notification sockets fed by one Redis subscription
+    """
+
+    def __init__(self):
+        self._connections: Dict[int, Set[NotificationConnection]] = {}
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(connections) for connections in self._connections.values())
+
+    def register(self, connection: NotificationConnection):
+        """Start routing a user's notifications to a connection"""
+        self._connections.setdefault(connection.user_id, set()).add(connection)
+
+    def unregister(self, connection: NotificationConnection):
+        """Stop routing to a connection"""
+        connections = self._connections.get(connection.user_id)
+        if connections is None:
+            return
+        connections.discard(connection)
+        if not connections:
+            del self._connections[connection.user_id]
+
+    def close_all(self, code: int):
+        """Close every local connection; clients reconnect and catch up"""
+        for connections in list(self._connections.values()):
+            for connection in list(connections):
+                connection.close(code)
+
+    def route(self, data: str):
+        """Deliver one published message to the recipients connected here"""
+        try:
+            message = json.loads(data)
+            recipients: List[list] = message.pop("recipients")
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring malformed notification message: {e}")
+            return
+
+        for notification_id, user_id in recipients:
+            connections = self._connections.get(user_id)
+            if not connections:
+                continue
+            notification = dict(message, id=notification_id)
+            for connection in list(connections):
+                connection.push(notification)
+
+    async def run(self):
+        """Hold the worker's subscription until cancelled, resubscribing on failure"""
+        client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        try:
+            while True:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                try:
+                    await pubsub.subscribe(CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.route(message["data"])
+                except redis.RedisError as e:
+                    logger.warning(f"Notification subscription lost: {e}")
+                    # Messages published while unsubscribed are lost here
+                    self.close_all(CLOSE_SERVICE_RESTART)
+                    await asyncio.sleep(1)
+                finally:
+                    await pubsub.close()
+        finally:
+            self.close_all(CLOSE_GOING_AWAY)
+            await client.close()
+
+
+notification_hub = NotificationHub()
\ No newline at end of file
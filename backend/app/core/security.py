@@ -2,14 +2,20 @@
 Security utilities for authentication and authorization
 """
 
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+from typing import Any, Callable, Dict, Optional, Union
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.config import settings
+from app.core.exceptions import ServiceUnavailableError
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -32,7 +38,13 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     
-    to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
+    to_encode = {
+        "exp": expire,
+        "iat": datetime.utcnow(),
+        "jti": uuid.uuid4().hex,
+        "sub": str(subject),
+        "type": "access"
+    }
     encoded_jwt = jwt.encode(
         to_encode, 
         settings.SECRET_KEY, 
@@ -55,7 +67,13 @@ def create_refresh_token(
             days=settings.REFRESH_TOKEN_EXPIRE_DAYS
         )
     
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
+    to_encode = {
+        "exp": expire,
+        "iat": datetime.utcnow(),
+        "jti": uuid.uuid4().hex,
+        "sub": str(subject),
+        "type": "refresh"
+    }
     encoded_jwt = jwt.encode(
         to_encode, 
         settings.SECRET_KEY, 
@@ -64,6 +82,20 @@ def create_refresh_token(
     return encoded_jwt
 
 
+def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode JWT token and return its claims
+    """
+    try:
+        return jwt.decode(
+            token, 
+            settings.SECRET_KEY, 
+            algorithms=[settings.ALGORITHM]
+        )
+    except JWTError:
+        return None
+
+
 def verify_token(token: str, token_type: str = "access") -> Optional[str]:
     """
     Verify JWT token and return subject
@@ -99,6 +131,98 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordHasher:
+    """
+    Bounded executor for bcrypt hashing and verification
+
+    Keeps CPU-heavy bcrypt work off the event loop and rejects new work
+    with a 503 once all workers are busy and the wait queue is full.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, retry_after: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hash"
+        )
+        self._limit = max_workers + max_queue
+        self._retry_after = retry_after
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    def _release(self, future=None):
+        with self._lock:
+            self._in_flight -= 1
+
+    async def _submit(self, func: Callable, *args) -> Any:
+        with self._lock:
+            if self._in_flight >= self._limit:
+                self._rejected += 1
+                raise ServiceUnavailableError(
+                    "Authentication service is busy, please retry",
+                    retry_after=self._retry_after
+                )
+            self._in_flight += 1
+
+        submitted_at = time.perf_counter()
+
+        def timed_call():
+            started_at = time.perf_counter()
+            result = func(*args)
+            return result, started_at - submitted_at, time.perf_counter() - started_at
+
+        try:
+            future = self._executor.submit(timed_call)
+        except Exception:
+            self._release()
+            raise
+        # Released when the work finishes, not when the caller stops waiting:
+        # a cancelled request leaves bcrypt running in its worker
+        future.add_done_callback(self._release)
+        result, wait, run = await asyncio.wrap_future(future)
+
+        with self._lock:
+            self._completed += 1
+            self._total_wait += wait
+            self._total_run += run
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Hash password in the executor"""
+        return await self._submit(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify password in the executor"""
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get executor queue depth and timing statistics"""
+        with self._lock:
+            completed = self._completed
+            return {
+                "in_flight": self._in_flight,
+                "limit": self._limit,
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait / completed * 1000, 3) if completed else 0.0,
+                "avg_run_ms": round(self._total_run / completed * 1000, 3) if completed else 0.0,
+            }
+
+    def shutdown(self):
+        """Stop accepting work and release worker threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER
+)
+
+
 def get_current_user_id(credentials: HTTPAuthorizationCredentials) -> int:
     """
     Extract and verify current user ID from token
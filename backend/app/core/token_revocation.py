@@ -0,0 +1,150 @@
+"""
+Token revocation backed by Redis with an in-process filter
+
+Logout revokes a single token by JTI and password reset revokes every
+token a user was issued before that moment. Redis is the source of truth;
+each worker keeps a periodically synced Bloom filter of revoked JTIs and a
+map of per-user "tokens before" timestamps so the per-request check in
+deps.get_current_user stays in memory. Redis is only consulted when the
+Bloom filter reports a possible hit.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import Dict, Optional
+
+import redis
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import redis_client
+
+logger = logging.getLogger(__name__)
+
+REVOKED_JTIS_KEY = "auth:revoked:jtis"  # sorted set: jti -> token expiry
+REVOKED_USERS_KEY = "auth:revoked:users"  # hash: user_id -> tokens-before timestamp
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self._size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self._hash_count = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self._hash_count):
+            yield (h1 + i * h2) % self._size
+
+    def add(self, item: str):
+        """Add item to the filter"""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class TokenRevocationStore:
+    """
+    Redis revocation list mirrored into per-worker memory
+    """
+
+    def __init__(self, sync_interval: int, capacity: int, error_rate: float):
+        self._sync_interval = sync_interval
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._jti_filter = BloomFilter(capacity, error_rate)
+        self._users_before: Dict[int, int] = {}
+
+    async def is_revoked(self, user_id: int, jti: Optional[str], issued_at: Optional[int]) -> bool:
+        """Check whether a decoded token has been revoked"""
+        tokens_before = self._users_before.get(user_id)
+        if tokens_before is not None and (issued_at is None or issued_at < tokens_before):
+            return True
+
+        if jti and jti in self._jti_filter:
+            return await run_in_threadpool(self._confirm_jti, jti)
+        return False
+
+    def _confirm_jti(self, jti: str) -> bool:
+        try:
+            expires_at = redis_client.zscore(REVOKED_JTIS_KEY, jti)
+        except redis.RedisError as e:
+            # Fail closed: the filter said the token may be revoked
+            logger.warning(f"Token revocation lookup failed: {e}")
+            return True
+        return expires_at is not None and expires_at > time.time()
+
+    async def revoke_token(self, jti: str, expires_at: int):
+        """Revoke a single token until it would have expired anyway"""
+        await run_in_threadpool(redis_client.zadd, REVOKED_JTIS_KEY, {jti: expires_at})
+        self._jti_filter.add(jti)
+
+    async def revoke_user(self, user_id: int):
+        """Revoke every token issued to the user before now"""
+        tokens_before = int(time.time())
+        await run_in_threadpool(redis_client.hset, REVOKED_USERS_KEY, str(user_id), tokens_before)
+        self._users_before[user_id] = tokens_before
+
+    def sync(self):
+        """Reload the in-process filter and timestamp map from Redis"""
+        now = int(time.time())
+        refresh_lifetime = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
+
+        try:
+            pipe = redis_client.pipeline()
+            pipe.zremrangebyscore(REVOKED_JTIS_KEY, "-inf", now)
+            pipe.zrangebyscore(REVOKED_JTIS_KEY, now, "+inf")
+            pipe.hgetall(REVOKED_USERS_KEY)
+            _, jtis, users = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Token revocation sync failed: {e}")
+            return
+
+        jti_filter = BloomFilter(self._capacity, self._error_rate)
+        for jti in jtis:
+            jti_filter.add(jti)
+
+        users_before = {}
+        expired_users = []
+        for user_id, tokens_before in users.items():
+            if int(tokens_before) < now - refresh_lifetime:
+                # Every token issued before this has expired
+                expired_users.append(user_id)
+            else:
+                users_before[int(user_id)] = int(tokens_before)
+
+        if expired_users:
+            try:
+                redis_client.hdel(REVOKED_USERS_KEY, *expired_users)
+            except redis.RedisError as e:
+                logger.warning(f"Token revocation cleanup failed: {e}")
+
+        self._jti_filter = jti_filter
+        self._users_before = users_before
+
+    async def run_sync_loop(self):
+        """Periodically sync from Redis until cancelled"""
+        while True:
+            await run_in_threadpool(self.sync)
+            await asyncio.sleep(self._sync_interval)
+
+
+token_revocation = TokenRevocationStore(
+    sync_interval=settings.TOKEN_REVOCATION_SYNC_SECONDS,
+    capacity=settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE
+)
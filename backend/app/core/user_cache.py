@@ -0,0 +1,212 @@
+"""
+Two-tier cache for the authenticated user principal
+
+Holds only the fields authorization needs (id, role, center_id, status) in
+an in-process LRU backed by Redis, so authenticated requests can skip the
+primary-key lookup in deps.get_current_user.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import redis
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import redis_client
+from app.models.user import User, UserRole, UserStatus
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "auth:user:"
+
+
+class CachedUser:
+    """
+    Authorization view of a user, safe to share across requests
+    """
+    __slots__ = ("id", "role", "center_id", "status")
+
+    def __init__(self, id: int, role: UserRole, center_id: Optional[int], status: UserStatus):
+        self.id = id
+        self.role = UserRole(role)
+        self.center_id = center_id
+        self.status = UserStatus(status) if status else UserStatus.ACTIVE
+
+    def __repr__(self):
+        return f"<CachedUser(id={self.id}, role={self.role})>"
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        """Build from a User row"""
+        return cls(user.id, user.role, user.center_id, user.status)
+
+    @classmethod
+    def from_json(cls, data: str) -> "CachedUser":
+        """Build from the Redis representation"""
+        return cls(**json.loads(data))
+
+    def to_json(self) -> str:
+        """Serialize for Redis"""
+        return json.dumps({
+            "id": self.id,
+            "role": self.role.value,
+            "center_id": self.center_id,
+            "status": self.status.value
+        })
+
+    def is_active(self):
+        """Check if user is active"""
+        return self.status == UserStatus.ACTIVE
+
+    def is_admin(self):
+        """Check if user has admin privileges"""
+        return self.role in [UserRole.SUPER_ADMIN, UserRole.CENTER_ADMIN]
+
+    def is_faculty(self):
+        """Check if user is faculty"""
+        return self.role == UserRole.FACULTY
+
+    def is_student(self):
+        """Check if user is student"""
+        return self.role == UserRole.STUDENT
+
+    def can_access_center(self, center_id: int) -> bool:
+        """Check if user can access a specific center"""
+        if self.role == UserRole.SUPER_ADMIN:
+            return True
+        return self.center_id == center_id
+
+
+class UserCache:
+    """
+    In-process TTL LRU in front of a shared Redis tier
+    """
+
+    def __init__(self, max_size: int, local_ttl: int, redis_ttl: int):
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self._local_ttl = local_ttl
+        self._redis_ttl = redis_ttl
+
+    def _get_local(self, user_id: int) -> Optional[CachedUser]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def _set_local(self, user: CachedUser):
+        with self._lock:
+            self._entries[user.id] = (user, time.monotonic() + self._local_ttl)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def _get_remote(self, user_id: int) -> Optional[CachedUser]:
+        try:
+            data = redis_client.get(f"{REDIS_KEY_PREFIX}{user_id}")
+        except redis.RedisError as e:
+            logger.warning(f"User cache read failed: {e}")
+            return None
+        return CachedUser.from_json(data) if data else None
+
+    def _set_remote(self, user: CachedUser):
+        try:
+            redis_client.set(f"{REDIS_KEY_PREFIX}{user.id}", user.to_json(), ex=self._redis_ttl)
+        except redis.RedisError as e:
+            logger.warning(f"User cache write failed: {e}")
+
+    async def get(self, user_id: int) -> Optional[CachedUser]:
+        """Get user from the local tier, falling back to Redis"""
+        user = self._get_local(user_id)
+        if user is not None:
+            return user
+
+        user = await run_in_threadpool(self._get_remote, user_id)
+        if user is not None:
+            self._set_local(user)
+        return user
+
+    async def set(self, user: CachedUser):
+        """Store user in both tiers"""
+        self._set_local(user)
+        await run_in_threadpool(self._set_remote, user)
+
+    def _delete_remote(self, user_ids: tuple):
+        try:
+            redis_client.delete(*(f"{REDIS_KEY_PREFIX}{user_id}" for user_id in user_ids))
+        except redis.RedisError as e:
+            logger.warning(f"User cache invalidation failed: {e}")
+
+    def invalidate(self, *user_ids: int):
+        """Drop users from both tiers"""
+        if not user_ids:
+            return
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._delete_remote(user_ids)
+        else:
+            # Called from an AsyncSession commit; keep the Redis round trip off the event loop
+            loop.run_in_executor(None, self._delete_remote, user_ids)
+
+
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    local_ttl=settings.USER_CACHE_LOCAL_TTL_SECONDS,
+    redis_ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+# Invalidate cached principals when authorization fields change.
+# Bulk Query.update()/delete() bypasses these hooks and must call
+# user_cache.invalidate() explicitly.
+_PENDING_KEY = "user_cache_invalidations"
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_user_changes(session, flush_context, instances):
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        state = inspect(obj)
+        if state.attrs.role.history.has_changes() or state.attrs.status.history.has_changes():
+            pending.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            pending.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    # Releasing a savepoint fires this too; wait for the outermost commit
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        user_cache.invalidate(*pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    # A failed savepoint keeps invalidations from earlier flushes
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
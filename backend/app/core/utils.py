@@ -5,12 +5,13 @@ Utility functions for the Student Academics Management System
 import re
 import secrets
 from datetime import datetime, date, timedelta
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from passlib.context import CryptContext
 import hashlib
 import base64
 
 from app.config import settings
+from app.core.exceptions import ValidationError
 
 
 # Password hashing context
@@ -372,6 +373,33 @@ def create_pagination_response(
     }
 
 
+def encode_keyset_cursor(created_at: datetime, id: int) -> str:
+    """Create an opaque cursor for the row after which the next page starts"""
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_keyset_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor created by encode_keyset_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(id)
+    except ValueError:
+        raise ValidationError("Invalid cursor", details={"cursor": cursor})
+
+
+def create_keyset_params(cursor: Optional[str] = None, limit: int = None) -> Dict[str, Any]:
+    """Create keyset pagination parameters"""
+    if limit is None:
+        limit = settings.DEFAULT_PAGE_SIZE
+    
+    return {
+        "after": decode_keyset_cursor(cursor) if cursor else None,
+        "limit": min(limit, settings.MAX_PAGE_SIZE)
+    }
+
+
 def mask_email(email: str) -> str:
     """Mask email for privacy"""
     if '@' not in email:
@@ -2,25 +2,147 @@
 Database configuration and connection management
 """
 
-from sqlalchemy import create_engine
+import os
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 import redis
 
 from app.config import settings
+from app.core.exceptions import ConfigurationError
+
+
+class PoolStats:
+    """
+    Thread-safe counters for connection pool checkouts
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, wait: float, timed_out: bool = False):
+        """Record how long a caller waited for a connection"""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict:
+        """Get a copy of the current counters"""
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that measures how long callers wait for a connection
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_stats.record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_stats.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+def _engine_options(database_url: str) -> dict:
+    """
+    Build pool options for the configured database
+    """
+    if "sqlite" in database_url:
+        # SQLite is only used for tests; share a single connection
+        return {
+            "poolclass": StaticPool,
+            "connect_args": {"check_same_thread": False},
+        }
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    poolclass=StaticPool,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
+    **_engine_options(settings.DATABASE_URL),
 )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_database_url(database_url: str) -> str:
+    """
+    Map the configured sync driver URL onto its asyncio driver
+    """
+    if database_url.startswith("sqlite"):
+        return database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if database_url.startswith(prefix):
+            return "postgresql+asyncpg://" + database_url[len(prefix):]
+    return database_url
+
+
+def _async_engine_options(database_url: str) -> dict:
+    """
+    Build pool options for the asyncio engine
+    """
+    if "sqlite" in database_url:
+        return {"poolclass": StaticPool}
+
+    # Async engines must use the default AsyncAdaptedQueuePool
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+# Create asyncio engine and session factory
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or _async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    **_async_engine_options(settings.DATABASE_URL),
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -30,6 +152,60 @@ redis_client = redis.from_url(
     encoding="utf-8",
     decode_responses=True
 )
+# Undecoded client for binary values such as attendance bitmaps
+redis_binary_client = redis.from_url(settings.REDIS_URL)
+
+
+def get_pool_status() -> dict:
+    """
+    Get connection pool usage and checkout wait statistics
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+
+    capacity = pool.size() + pool._max_overflow
+    checked_out = pool.checkedout()
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "saturation": round(checked_out / capacity, 3) if capacity > 0 else 0.0,
+        **pool_stats.snapshot(),
+    }
+
+
+def get_alembic_head() -> str:
+    """
+    Get the head revision from the migration scripts on disk
+    """
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config = Config(os.path.join(backend_dir, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(backend_dir, "alembic"))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+def verify_schema_revision():
+    """
+    Fail fast if the database is not migrated to the Alembic head
+    """
+    expected = get_alembic_head()
+    with engine.connect() as connection:
+        current = connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+    if current != expected:
+        raise ConfigurationError(
+            f"Database schema revision {current} does not match migration head {expected}; "
+            "run 'alembic upgrade head'",
+            details={"current": current, "expected": expected}
+        )
+    return current
 
 
 def get_db():
@@ -43,6 +219,14 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependency to get asyncio database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def get_redis():
     """
     Dependency to get Redis client
@@ -5,47 +5,79 @@ Main FastAPI application for Student Academics Management System
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-import time
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+import asyncio
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from contextlib import asynccontextmanager
 
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine, Base, get_pool_status, verify_schema_revision
 from app.core.exceptions import CustomException
-
-# Configure logging
+from app.core.notification_hub import notification_hub
+from app.core.security import password_hasher
+from app.core.token_revocation import token_revocation
+from app.middleware import RequestInstrumentationMiddleware
+
+# Configure logging: records are queued on the calling thread and written
+# to file/stream by a background listener, keeping disk I/O off the event loop
+log_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+log_handlers = [
+    logging.FileHandler(settings.LOG_FILE),
+    logging.StreamHandler()
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(settings.LOG_FILE),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(log_queue)]
 )
+log_listener.start()
 
 logger = logging.getLogger(__name__)
 
 
+def prepare_database():
+    """Verify (or in development, create) the database schema"""
+    # Schema is owned by Alembic; create_all is a development-only shortcut
+    if settings.DB_CREATE_ALL_ON_STARTUP:
+        import app.models  # noqa: F401  register every table on Base.metadata
+        Base.metadata.create_all(bind=engine)
+        logger.info("Database tables created with create_all (development mode)")
+    elif settings.DB_VERIFY_REVISION_ON_STARTUP:
+        revision = verify_schema_revision()
+        logger.info(f"Database schema at revision {revision}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     logger.info("Starting up Student Academics Management System...")
     
-    # Create database tables
-    try:
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
-    except Exception as e:
-        logger.error(f"Error creating database tables: {e}")
+    prepare_database()
+    
+    # Keep the in-process token revocation filter in sync with Redis
+    revocation_sync = asyncio.create_task(token_revocation.run_sync_loop())
+    
+    # One Redis subscription per worker feeds every notification socket
+    notification_subscription = asyncio.create_task(notification_hub.run())
     
     yield
     
     # Shutdown
     logger.info("Shutting down Student Academics Management System...")
+    revocation_sync.cancel()
+    notification_subscription.cancel()
+    password_hasher.shutdown()
+    log_listener.stop()
 
 
 # Create FastAPI application
@@ -76,39 +108,8 @@ if not settings.DEBUG:
     )
 
 
-# Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add processing time header to responses"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
-
-
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log incoming requests"""
-    start_time = time.time()
-    
-    # Log request
-    logger.info(
-        f"Request: {request.method} {request.url} - "
-        f"Client: {request.client.host if request.client else 'unknown'}"
-    )
-    
-    response = await call_next(request)
-    
-    # Log response
-    process_time = time.time() - start_time
-    logger.info(
-        f"Response: {response.status_code} - "
-        f"Time: {process_time:.4f}s"
-    )
-    
-    return response
+# Request timing and logging middleware
+app.add_middleware(RequestInstrumentationMiddleware)
 
 
 # Exception handlers
@@ -122,7 +123,8 @@ async def custom_exception_handler(request: Request, exc: CustomException):
             "message": exc.message,
             "details": exc.details,
             "error_code": exc.error_code
-        }
+        },
+        headers=exc.headers
     )
 
 
@@ -174,10 +176,20 @@ async def health_check():
     return {
         "status": "healthy",
         "version": settings.VERSION,
-        "environment": settings.ENVIRONMENT
+        "environment": settings.ENVIRONMENT,
+        "database_pool": get_pool_status(),
+        "password_hasher": password_hasher.stats(),
+        "notification_sockets": notification_hub.connection_count
     }
 
 
+# Metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 # Root endpoint
 @app.get("/")
 async def root():
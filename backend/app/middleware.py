@@ -0,0 +1,70 @@
+"""
+Custom ASGI middleware
+"""
+
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import REQUESTS_IN_FLIGHT, observe_request, start_request_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Time each HTTP request once, add the X-Process-Time header, record
+    Prometheus metrics and emit a single structured log record per request
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+        query_stats = start_request_query_stats()
+        REQUESTS_IN_FLIGHT.inc()
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", f"{time.perf_counter() - start_time:.6f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            process_time = time.perf_counter() - start_time
+            REQUESTS_IN_FLIGHT.dec()
+
+            # Label by route template to keep cardinality bounded
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            observe_request(scope["method"], route_path, status_code, process_time, query_stats)
+
+            client = scope.get("client")
+            logger.info(
+                "%s %s - %s - %.4fs",
+                scope["method"],
+                scope["path"],
+                status_code,
+                process_time,
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "query_string": scope.get("query_string", b"").decode("latin-1"),
+                    "status_code": status_code,
+                    "duration_ms": round(process_time * 1000, 3),
+                    "db_queries": query_stats.count,
+                    "client": client[0] if client else "unknown",
+                }
+            )
@@ -15,10 +15,12 @@ from .student_batch import StudentBatch
 from .student_leave import StudentLeave
 from .student_transfer import StudentTransfer
 from .attendance import Attendance
+from .attendance_daily_rollup import AttendanceDailyRollup
 from .batch_topic import BatchTopic
 from .batch_subtopic import BatchSubtopic
 from .feedback import Feedback
 from .notification import Notification
+from .notification_outbox import NotificationOutbox
 from .batch_extension import BatchExtension
 from .faculty_availability import FacultyAvailability
 from .faculty_performance import FacultyPerformance
@@ -37,10 +39,12 @@ __all__ = [
     "StudentLeave",
     "StudentTransfer",
     "Attendance",
+    "AttendanceDailyRollup",
     "BatchTopic",
     "BatchSubtopic",
     "Feedback",
     "Notification",
+    "NotificationOutbox",
     "BatchExtension",
     "FacultyAvailability",
     "FacultyPerformance",
@@ -2,7 +2,10 @@
 Attendance model for tracking student attendance
 """
 
-from sqlalchemy import Column, Integer, Date, Text, Enum, ForeignKey, DateTime
+from sqlalchemy import (
+    DDL, BigInteger, Column, Integer, Date, Text, Enum, ForeignKey, DateTime, FetchedValue, Index, UniqueConstraint,
+    event
+)
 from sqlalchemy.orm import relationship
 import enum
 
@@ -20,17 +23,31 @@ class AttendanceStatus(str, enum.Enum):
 class Attendance(BaseModel):
     """
     Attendance model for tracking student attendance
+
+    Range-partitioned by month on date, so date is part of the primary key.
+    Monthly partitions are managed by scripts/maintain_attendance_partitions.py.
     """
     __tablename__ = "attendance"
+    __table_args__ = (
+        UniqueConstraint("student_id", "batch_id", "date", name="uq_attendance_student_batch_date"),
+        Index("ix_attendance_batch_id_date", "batch_id", "date"),
+        Index("ix_attendance_faculty_id_date", "faculty_id", "date"),
+        Index("ix_attendance_batch_id_sync_xid", "batch_id", "sync_xid"),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
 
     student_id = Column(Integer, ForeignKey("students.user_id"), nullable=False)
     batch_id = Column(Integer, ForeignKey("batches.id"), nullable=False)
     faculty_id = Column(Integer, ForeignKey("faculty.user_id"), nullable=False)
-    date = Column(Date, nullable=False)
+    date = Column(Date, primary_key=True, nullable=False)
     status = Column(Enum(AttendanceStatus), nullable=False)
     topic_covered = Column(Text)
     remarks = Column(Text)
     marked_at = Column(DateTime)
+    # Id of the last writing transaction, maintained by a database trigger
+    sync_xid = Column(BigInteger, server_default=FetchedValue(), server_onupdate=FetchedValue())
 
     # Relationships
     student = relationship("Student", back_populates="attendance_records")
@@ -168,4 +185,12 @@ class Attendance(BaseModel):
         """Calculate if makeup class is required"""
         # This would need to be implemented based on institute policy
         # For now, return False
-        return False
\ No newline at end of file
+        return False
+
+
+# Tables created with create_all start with only the catch-all partition
+event.listen(
+    Attendance.__table__,
+    "after_create",
+    DDL("CREATE TABLE attendance_default PARTITION OF attendance DEFAULT").execute_if(dialect="postgresql")
+)
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""
+AttendanceDailyRollup model for per-batch daily attendance counts
+"""
+
+from sqlalchemy import Column, Integer, Date, ForeignKey, Index, UniqueConstraint
+
+from app.models.base import BaseModel
+
+
+class AttendanceDailyRollup(BaseModel):
+    """
+    Attendance status counts per batch and day
+
+    Maintained by statement-level triggers on the attendance table, so every
+    write path keeps it current; rebuild with
+    scripts/rebuild_attendance_rollup.py.
+    """
+    __tablename__ = "attendance_daily_rollup"
+    __table_args__ = (
+        UniqueConstraint("batch_id", "date", name="uq_attendance_daily_rollup_batch_id_date"),
+        Index("ix_attendance_daily_rollup_center_id_date", "center_id", "date"),
+    )
+
+    batch_id = Column(Integer, ForeignKey("batches.id"), nullable=False)
+    center_id = Column(Integer, ForeignKey("centers.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    present_count = Column(Integer, nullable=False, default=0)
+    absent_count = Column(Integer, nullable=False, default=0)
+    late_count = Column(Integer, nullable=False, default=0)
+    excused_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<AttendanceDailyRollup(batch_id={self.batch_id}, date={self.date})>"
+
+    def get_total_count(self):
+        """Get number of attendance records for the day"""
+        return self.present_count + self.absent_count + self.late_count + self.excused_count
+
+    def get_attendance_percentage(self):
+        """Get percentage of students present"""
+        total = self.get_total_count()
+        if not total:
+            return 0.0
+        return (self.present_count / total) * 100
\ No newline at end of file
@@ -2,7 +2,7 @@
 BatchTopic model for managing topic scheduling within batches
 """
 
-from sqlalchemy import Column, Integer, Date, Text, Enum, ForeignKey
+from sqlalchemy import BigInteger, Column, Integer, Date, Text, Enum, ForeignKey, FetchedValue, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -22,6 +22,9 @@ class BatchTopic(BaseModel):
     BatchTopic model for managing topic scheduling within batches
     """
     __tablename__ = "batch_topics"
+    __table_args__ = (
+        Index("ix_batch_topics_batch_id_sync_xid", "batch_id", "sync_xid"),
+    )
 
     batch_id = Column(Integer, ForeignKey("batches.id"), nullable=False)
     topic_id = Column(Integer, ForeignKey("topics.id"), nullable=False)
@@ -30,6 +33,8 @@ class BatchTopic(BaseModel):
     faculty_id = Column(Integer, ForeignKey("faculty.user_id"), nullable=False)
     status = Column(Enum(BatchTopicStatus), default=BatchTopicStatus.PENDING)
     notes = Column(Text)
+    # Id of the last writing transaction, maintained by a database trigger
+    sync_xid = Column(BigInteger, server_default=FetchedValue(), server_onupdate=FetchedValue())
 
     # Relationships
     batch = relationship("Batch", back_populates="batch_topics")
@@ -55,6 +60,18 @@ class BatchTopic(BaseModel):
         """Check if topic was skipped"""
         return self.status == BatchTopicStatus.SKIPPED
 
+    def can_be_modified(self, user_role, user_id):
+        """Check if topic progress can be modified by the user"""
+        # Faculty can modify topics assigned to them
+        if user_role == "faculty" and self.faculty_id == user_id:
+            return True
+        
+        # Center admin and above can modify any topic
+        if user_role in ["center_admin", "super_admin", "academic_head"]:
+            return True
+        
+        return False
+
     def start_topic(self, faculty_id=None):
         """Mark topic as in progress"""
         self.status = BatchTopicStatus.IN_PROGRESS
@@ -77,7 +77,7 @@ class Faculty(BaseModel):
         """Get total number of students taught by this faculty"""
         total_students = 0
         for batch in self.batches:
-            total_students += len(batch.students)
+            total_students += len(batch.student_batches)
         return total_students
 
     def get_completed_students_count(self):
@@ -2,7 +2,7 @@
 FacultyPerformance model for tracking faculty performance metrics
 """
 
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -13,6 +13,9 @@ class FacultyPerformance(BaseModel):
     FacultyPerformance model for tracking faculty performance metrics
     """
     __tablename__ = "faculty_performance"
+    __table_args__ = (
+        UniqueConstraint("faculty_id", "evaluation_period", name="uq_faculty_performance_faculty_id_period"),
+    )
 
     faculty_id = Column(Integer, ForeignKey("faculty.user_id"), nullable=False)
     evaluation_period = Column(String(20), nullable=False)  # e.g., '2023-10', 'Q4-2023'
@@ -247,28 +250,20 @@ class FacultyPerformance(BaseModel):
         return comparison
 
     def get_ranking_percentile(self, all_performances):
-        """Get ranking percentile among all faculty performances"""
-        if not all_performances:
-            return 0
-        
-        scores = [
-            float(p.overall_score or 0) 
-            for p in all_performances 
+        """
+        Get ranking percentile among all faculty performances
+
+        Share of the other scored performances with a lower score (PERCENT_RANK).
+        For repeated lookups within a period use faculty_ranking_service.
+        """
+        from app.services.faculty_ranking_service import percentile_for_score
+
+        scores = sorted(
+            float(p.overall_score)
+            for p in all_performances or []
             if p.overall_score is not None
-        ]
-        
-        if not scores:
-            return 0
-        
-        scores.sort(reverse=True)
-        current_score = float(self.overall_score or 0)
-        
-        try:
-            rank = scores.index(current_score) + 1
-            percentile = ((len(scores) - rank) / len(scores)) * 100
-            return round(percentile, 2)
-        except ValueError:
-            return 0
+        )
+        return percentile_for_score(scores, self.overall_score)
 
     def create_performance_report(self):
         """Create detailed performance report"""
@@ -2,7 +2,7 @@
 Notification model for system notifications
 """
 
-from sqlalchemy import Column, Integer, String, Text, Enum, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Enum, ForeignKey, Boolean, DateTime, Index, text
 from sqlalchemy.orm import relationship
 import enum
 
@@ -44,6 +44,15 @@ class Notification(BaseModel):
     # Relationships
     user = relationship("User", back_populates="notifications")
 
+    # Keyset feed order is (created_at, id) descending within a user
+    __table_args__ = (
+        Index("ix_notifications_user_id_created_at_id", "user_id", text("created_at DESC"), text("id DESC")),
+        Index(
+            "ix_notifications_unread_user_id_created_at_id", "user_id", text("created_at DESC"), text("id DESC"),
+            postgresql_where=text("is_read = false")
+        ),
+    )
+
     def __repr__(self):
         return f"<Notification(id={self.id}, user_id={self.user_id}, title={self.title}, type={self.type})>"
 
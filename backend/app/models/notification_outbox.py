@@ -0,0 +1,64 @@
+"""
+NotificationOutbox model for deferred notification fan-out
+"""
+
+from sqlalchemy import Column, Integer, String, Text, Enum, DateTime, Index
+from sqlalchemy.dialects.postgresql import ARRAY
+import enum
+
+from app.models.base import BaseModel
+from app.models.notification import NotificationCategory, NotificationType
+from app.models.user import UserRole
+
+
+class NotificationAudience(str, enum.Enum):
+    """Notification audience enumeration"""
+    USER = "user"        # audience_id is a user id
+    USERS = "users"      # recipient_ids lists the user ids
+    BATCH = "batch"      # active students of batch audience_id
+    CENTER = "center"    # active users of center audience_id, optionally one role
+
+
+class OutboxStatus(str, enum.Enum):
+    """Outbox event status enumeration"""
+    PENDING = "pending"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class NotificationOutbox(BaseModel):
+    """
+    One notification addressed to an audience, written in the caller's
+    transaction and expanded into per-user notifications by a worker
+    """
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index(
+            "ix_notification_outbox_pending", "id",
+            postgresql_where="status = 'PENDING'"
+        ),
+    )
+
+    audience = Column(Enum(NotificationAudience), nullable=False)
+    audience_id = Column(Integer)
+    audience_role = Column(Enum(UserRole))
+    recipient_ids = Column(ARRAY(Integer))
+    title = Column(String(200), nullable=False)
+    message = Column(Text, nullable=False)
+    type = Column(Enum(NotificationType), nullable=False)
+    category = Column(Enum(NotificationCategory), nullable=False)
+    related_id = Column(Integer)
+    status = Column(Enum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False)
+    # Fan-out progress: recipients are delivered in ascending user id order
+    last_user_id = Column(Integer, default=0, nullable=False)
+    delivered_count = Column(Integer, default=0, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text)
+    processed_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<NotificationOutbox(id={self.id}, audience={self.audience}, status={self.status})>"
+
+    def is_pending(self):
+        """Check if the event still has recipients to deliver"""
+        return self.status == OutboxStatus.PENDING
\ No newline at end of file
@@ -3,7 +3,7 @@ Student model for student-specific information and management
 """
 
 from sqlalchemy import Column, Integer, String, Date, Text, Enum, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import object_session, relationship
 import enum
 
 from app.models.base import BaseModel
@@ -89,7 +89,19 @@ class Student(BaseModel):
         return total_progress / len(active_batches)
 
     def get_attendance_percentage(self, batch_id=None):
-        """Get attendance percentage for a specific batch or overall"""
+        """
+        Get attendance percentage for a specific batch or overall
+
+        Attached instances read the attendance bitmaps
+        (attendance_bitmap_service); detached ones fall back to the loaded
+        attendance records.
+        """
+        session = object_session(self)
+        if session is not None:
+            from app.services import attendance_bitmap_service
+
+            return attendance_bitmap_service.get_attendance_percentage(session, self.user_id, batch_id)
+
         if batch_id:
             batch_attendance = [
                 att for att in self.attendance_records 
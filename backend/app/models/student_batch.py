@@ -3,7 +3,7 @@ StudentBatch model for managing student enrollments in batches
 """
 
 from sqlalchemy import Column, Integer, Date, Text, Enum, ForeignKey, Numeric, String
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import object_session, relationship
 import enum
 
 from app.models.base import BaseModel
@@ -49,7 +49,19 @@ class StudentBatch(BaseModel):
         return self.status == StudentBatchStatus.COMPLETED
 
     def get_attendance_percentage(self):
-        """Get attendance percentage for this student in this batch"""
+        """
+        Get attendance percentage for this student in this batch
+
+        Attached instances read the attendance bitmaps
+        (attendance_bitmap_service); detached ones fall back to the loaded
+        attendance records.
+        """
+        session = object_session(self)
+        if session is not None:
+            from app.services import attendance_bitmap_service
+
+            return attendance_bitmap_service.get_attendance_percentage(session, self.student_id, self.batch_id)
+
         attendance_records = [
             att for att in self.student.attendance_records 
             if att.batch_id == self.batch_id
@@ -0,0 +1,69 @@
+"""
+Attendance schemas for API requests and responses
+"""
+
+import enum
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.models.attendance import AttendanceStatus
+
+
+class ExportFormat(str, enum.Enum):
+    """Attendance register export format"""
+    CSV = "csv"
+    XLSX = "xlsx"
+
+
+class AttendanceEntry(BaseModel):
+    """Attendance status for one student in a session"""
+    student_id: int
+    status: AttendanceStatus
+    remarks: Optional[str] = None
+
+
+class SessionAttendanceRequest(BaseModel):
+    """Attendance for a whole batch roster in one session"""
+    entries: List[AttendanceEntry]
+    topic_covered: Optional[str] = None
+
+
+class AttendanceMarkResult(BaseModel):
+    """Outcome of marking attendance for one student"""
+    student_id: int
+    status: AttendanceStatus
+    result: str  # created, updated or rejected
+    attendance_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class SessionAttendanceResponse(BaseModel):
+    """Session attendance marking response schema"""
+    batch_id: int
+    date: date
+    created: int
+    updated: int
+    rejected: int
+    results: List[AttendanceMarkResult]
+
+class AttendanceSummary(BaseModel):
+    """Attendance status counts for a period"""
+    present_count: int
+    absent_count: int
+    late_count: int
+    excused_count: int
+    total_count: int
+    attendance_percentage: float
+
+
+class DailyAttendanceSummary(AttendanceSummary):
+    """Attendance counts for one day"""
+    date: date
+
+
+class MonthlyAttendanceSummary(AttendanceSummary):
+    """Attendance counts for one month"""
+    year: int
+    month: int
\ No newline at end of file
@@ -0,0 +1,14 @@
+"""
+Batch schemas for API requests and responses
+"""
+
+from pydantic import BaseModel
+
+
+class BatchAnalytics(BaseModel):
+    """Batch analytics response schema"""
+    batch_id: int
+    attendance_percentage: float
+    completion_rate: float
+    average_progress: float
+    syllabus_completion_percentage: float
\ No newline at end of file
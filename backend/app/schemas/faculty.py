@@ -0,0 +1,16 @@
+"""
+Faculty schemas for API requests and responses
+"""
+
+from pydantic import BaseModel
+
+
+class FacultyStats(BaseModel):
+    """Faculty aggregate statistics response schema"""
+    faculty_id: int
+    total_students_taught: int
+    completed_students_count: int
+    completion_rate: float
+    average_feedback_rating: float
+    workload_percentage: float
+    total_classes_taken: int
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Notification schemas for API requests and responses
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.models.notification import NotificationCategory, NotificationType
+
+
+class NotificationResponse(BaseModel):
+    """Notification response schema"""
+    id: int
+    title: str
+    message: str
+    type: NotificationType
+    category: NotificationCategory
+    related_id: Optional[int] = None
+    is_read: bool
+    read_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
+
+
+class UnreadCount(BaseModel):
+    """Unread notification counts for the current user"""
+    total: int
+    by_category: Dict[NotificationCategory, int]
+
+
+class NotificationFeed(BaseModel):
+    """One page of the notification feed"""
+    items: List[NotificationResponse]
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Offline sync schemas for attendance and batch topic progress
+"""
+
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.models.attendance import AttendanceStatus
+from app.models.batch_topic import BatchTopicStatus
+
+
+class AttendanceChange(BaseModel):
+    """Attendance edit made on a client, keyed by student, batch and date"""
+    student_id: int
+    batch_id: int
+    date: date
+    status: AttendanceStatus
+    remarks: Optional[str] = None
+    topic_covered: Optional[str] = None
+    client_updated_at: datetime
+
+
+class BatchTopicChange(BaseModel):
+    """Batch topic progress edit made on a client"""
+    id: int
+    status: BatchTopicStatus
+    completed_date: Optional[date] = None
+    notes: Optional[str] = None
+    client_updated_at: datetime
+
+
+class SyncRequest(BaseModel):
+    """Pending client changes plus the last server version the client has seen"""
+    batch_ids: List[int]
+    since_version: Optional[int] = None
+    client_timestamp: datetime
+    attendance: List[AttendanceChange] = []
+    batch_topics: List[BatchTopicChange] = []
+
+
+class SyncChangeResult(BaseModel):
+    """Outcome of applying one client change"""
+    entity: str  # attendance or batch_topic
+    key: str
+    result: str  # applied, unchanged, conflict or rejected
+    error: Optional[str] = None
+
+
+class AttendanceSyncRecord(BaseModel):
+    """Server state of an attendance record"""
+    id: int
+    student_id: int
+    batch_id: int
+    faculty_id: int
+    date: date
+    status: AttendanceStatus
+    remarks: Optional[str] = None
+    topic_covered: Optional[str] = None
+    updated_at: datetime
+
+
+class BatchTopicSyncRecord(BaseModel):
+    """Server state of a batch topic"""
+    id: int
+    batch_id: int
+    topic_id: int
+    faculty_id: Optional[int] = None
+    status: BatchTopicStatus
+    scheduled_date: Optional[date] = None
+    completed_date: Optional[date] = None
+    notes: Optional[str] = None
+    updated_at: datetime
+
+
+class SyncResponse(BaseModel):
+    """Change results and every row changed since the client's version"""
+    server_version: int
+    server_timestamp: datetime
+    results: List[SyncChangeResult]
+    attendance: List[AttendanceSyncRecord]
+    batch_topics: List[BatchTopicSyncRecord]
\ No newline at end of file
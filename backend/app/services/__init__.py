@@ -0,0 +1,3 @@
+"""
+Business logic services
+"""
\ No newline at end of file
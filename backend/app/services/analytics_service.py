@@ -0,0 +1,164 @@
+"""
+Set-based batch analytics
+
+Query-level equivalents of the Batch analytics methods. Each function
+aggregates in the database for any number of batches at once instead of
+loading the attendance_records, student_batches and batch_topics
+collections, and returns the same values the per-object methods would.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.batch_topic import BatchTopic, BatchTopicStatus
+from app.models.student_batch import StudentBatch, StudentBatchStatus
+
+
+def get_attendance_percentages(
+    db: Session,
+    batch_ids: Iterable[int],
+    date_range: Optional[Tuple[date, date]] = None
+) -> Dict[int, float]:
+    """Attendance percentage per batch (Batch.get_attendance_percentage)"""
+    batch_ids = list(batch_ids)
+    query = db.query(
+        Attendance.batch_id,
+        func.count(Attendance.id),
+        func.count(Attendance.id).filter(Attendance.status == AttendanceStatus.PRESENT)
+    ).filter(Attendance.batch_id.in_(batch_ids))
+
+    if date_range:
+        query = query.filter(Attendance.date.between(date_range[0], date_range[1]))
+
+    counts = {
+        batch_id: (total, present)
+        for batch_id, total, present in query.group_by(Attendance.batch_id)
+    }
+
+    percentages = {}
+    for batch_id in batch_ids:
+        total, present = counts.get(batch_id, (0, 0))
+        percentages[batch_id] = (present / total) * 100 if total else 0.0
+    return percentages
+
+
+def get_attendance_percentage(
+    db: Session,
+    batch_id: int,
+    date_range: Optional[Tuple[date, date]] = None
+) -> float:
+    """Attendance percentage for one batch"""
+    return get_attendance_percentages(db, [batch_id], date_range)[batch_id]
+
+
+def get_recent_attendance_by_batch(
+    db: Session,
+    batch_ids: Iterable[int],
+    days: int = 7
+) -> Dict[int, List[Attendance]]:
+    """Attendance records from the last `days` days per batch (Batch.get_recent_attendance)"""
+    batch_ids = list(batch_ids)
+    recent_date = date.today() - timedelta(days=days)
+
+    records = {batch_id: [] for batch_id in batch_ids}
+    query = db.query(Attendance).filter(
+        Attendance.batch_id.in_(batch_ids),
+        Attendance.date >= recent_date
+    ).order_by(Attendance.batch_id, Attendance.date, Attendance.id)
+
+    for attendance in query:
+        records[attendance.batch_id].append(attendance)
+    return records
+
+
+def get_recent_attendance(db: Session, batch_id: int, days: int = 7) -> List[Attendance]:
+    """Recent attendance records for one batch"""
+    return get_recent_attendance_by_batch(db, [batch_id], days)[batch_id]
+
+
+def get_enrollment_stats(db: Session, batch_ids: Iterable[int]) -> Dict[int, dict]:
+    """
+    Completion rate and average progress per batch
+    (Batch.get_completion_rate, Batch.get_average_progress)
+    """
+    batch_ids = list(batch_ids)
+    is_active = StudentBatch.status == StudentBatchStatus.ACTIVE
+    query = db.query(
+        StudentBatch.batch_id,
+        func.count(StudentBatch.id),
+        func.count(StudentBatch.id).filter(StudentBatch.status == StudentBatchStatus.COMPLETED),
+        func.count(StudentBatch.id).filter(is_active),
+        func.sum(func.coalesce(StudentBatch.progress_percentage, 0)).filter(is_active)
+    ).filter(StudentBatch.batch_id.in_(batch_ids)).group_by(StudentBatch.batch_id)
+
+    rows = {row[0]: row[1:] for row in query}
+
+    stats = {}
+    for batch_id in batch_ids:
+        total, completed, active, progress_sum = rows.get(batch_id, (0, 0, 0, None))
+        stats[batch_id] = {
+            "completion_rate": (completed / total) * 100 if total else 0.0,
+            # Exact numeric SUM divided in Python matches the per-object average
+            "average_progress": progress_sum / active if active else 0.0
+        }
+    return stats
+
+
+def get_completion_rate(db: Session, batch_id: int) -> float:
+    """Student completion rate for one batch"""
+    return get_enrollment_stats(db, [batch_id])[batch_id]["completion_rate"]
+
+
+def get_average_progress(db: Session, batch_id: int):
+    """Average progress of active students in one batch"""
+    return get_enrollment_stats(db, [batch_id])[batch_id]["average_progress"]
+
+
+def get_syllabus_completion_percentages(db: Session, batch_ids: Iterable[int]) -> Dict[int, float]:
+    """Syllabus completion percentage per batch (Batch.get_syllabus_completion_percentage)"""
+    batch_ids = list(batch_ids)
+    query = db.query(
+        BatchTopic.batch_id,
+        func.count(BatchTopic.id),
+        func.count(BatchTopic.id).filter(BatchTopic.status == BatchTopicStatus.COMPLETED)
+    ).filter(BatchTopic.batch_id.in_(batch_ids)).group_by(BatchTopic.batch_id)
+
+    counts = {batch_id: (total, completed) for batch_id, total, completed in query}
+
+    percentages = {}
+    for batch_id in batch_ids:
+        total, completed = counts.get(batch_id, (0, 0))
+        percentages[batch_id] = (completed / total) * 100 if total else 0.0
+    return percentages
+
+
+def get_syllabus_completion_percentage(db: Session, batch_id: int) -> float:
+    """Syllabus completion percentage for one batch"""
+    return get_syllabus_completion_percentages(db, [batch_id])[batch_id]
+
+
+def get_batch_analytics(
+    db: Session,
+    batch_ids: Iterable[int],
+    date_range: Optional[Tuple[date, date]] = None
+) -> Dict[int, dict]:
+    """All batch analytics for many batches in three grouped queries"""
+    batch_ids = list(batch_ids)
+    attendance = get_attendance_percentages(db, batch_ids, date_range)
+    enrollment = get_enrollment_stats(db, batch_ids)
+    syllabus = get_syllabus_completion_percentages(db, batch_ids)
+
+    return {
+        batch_id: {
+            "batch_id": batch_id,
+            "attendance_percentage": attendance[batch_id],
+            "completion_rate": enrollment[batch_id]["completion_rate"],
+            "average_progress": enrollment[batch_id]["average_progress"],
+            "syllabus_completion_percentage": syllabus[batch_id]
+        }
+        for batch_id in batch_ids
+    }
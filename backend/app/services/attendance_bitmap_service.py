@@ -0,0 +1,329 @@
+"""
+Compact attendance bitmaps per (student, batch)
+
+Each pair has three Redis bitmaps indexed by session number (days since
+the batch start date): sessions marked, sessions present and sessions
+absent. Attendance percentage is two BITCOUNTs, and streak or consecutive
+absence checks walk only the most recent bits, instead of scanning the
+student's attendance rows.
+
+The bitmaps are derived data. ORM writes to Attendance are picked up by
+session events and core bulk writes call queue_update(); either way Redis
+is updated only after the transaction commits, and only for pairs whose
+bitmaps already exist, so a missing pair is never left holding a partial
+history. Missing bitmaps are rebuilt from the database on first read, and
+scripts/rebuild_attendance_bitmaps.py rebuilds them all.
+
+A read that loads a pair races with commits it cannot see. Each skipped
+update bumps the pair's generation key, and the load only stores its
+bitmaps if the generation is unchanged and no other reader stored them
+first. Bitmaps expire after ATTENDANCE_BITMAP_TTL_SECONDS, so any drift
+is bounded by a reload from the database.
+"""
+
+import logging
+from datetime import date
+from itertools import groupby
+from typing import Dict, Iterable, Optional, Tuple
+
+import redis
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import redis_binary_client
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.batch import Batch
+from app.models.student_batch import StudentBatch
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "attendance:bitmap:"
+BITMAP_KINDS = ("marked", "present", "absent")
+REBUILD_PIPELINE_SIZE = 1000
+
+_PENDING_KEY = "attendance_bitmap_updates"
+
+# KEYS = marked, present, absent bitmaps, generation; ARGV = offset, marked,
+# present, absent bits, generation TTL
+_APPLY_SESSION = redis_binary_client.register_script("""
+if redis.call('EXISTS', KEYS[1], KEYS[2], KEYS[3]) < 3 then
+    redis.call('INCR', KEYS[4])
+    redis.call('EXPIRE', KEYS[4], ARGV[5])
+    return 0
+end
+for i = 1, 3 do
+    redis.call('SETBIT', KEYS[i], ARGV[1], ARGV[i + 1])
+end
+return 1
+""")
+
+# KEYS = marked, present, absent bitmaps, generation; ARGV = generation read
+# before loading, TTL, marked, present, absent bitmaps
+_STORE_PAIR = redis_binary_client.register_script("""
+if redis.call('EXISTS', KEYS[1], KEYS[2], KEYS[3]) > 0 then
+    return 0
+end
+if (redis.call('GET', KEYS[4]) or '0') ~= ARGV[1] then
+    return 0
+end
+for i = 1, 3 do
+    redis.call('SET', KEYS[i], ARGV[i + 2], 'EX', ARGV[2])
+end
+return 1
+""")
+
+
+def _key(student_id: int, batch_id: int, kind: str) -> str:
+    return f"{KEY_PREFIX}{student_id}:{batch_id}:{kind}"
+
+
+def session_number(batch_start: date, attendance_date: date) -> int:
+    """Bit offset of a session within its batch"""
+    return (attendance_date - batch_start).days
+
+
+def _set_session(pipe, student_id: int, batch_id: int, offset: int, status: Optional[AttendanceStatus]):
+    if offset < 0:
+        return
+    pipe.setbit(_key(student_id, batch_id, "marked"), offset, int(status is not None))
+    pipe.setbit(_key(student_id, batch_id, "present"), offset, int(status == AttendanceStatus.PRESENT))
+    pipe.setbit(_key(student_id, batch_id, "absent"), offset, int(status == AttendanceStatus.ABSENT))
+
+
+def queue_update(
+    session: Session,
+    student_id: int,
+    batch_id: int,
+    batch_start: date,
+    attendance_date: date,
+    status: Optional[AttendanceStatus]
+):
+    """Record a status change to apply once the session commits; None clears the session"""
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    pending[(student_id, batch_id, session_number(batch_start, attendance_date))] = status
+
+
+def _apply_updates(updates: Dict[Tuple[int, int, int], Optional[AttendanceStatus]]):
+    try:
+        pipe = redis_binary_client.pipeline(transaction=False)
+        for (student_id, batch_id, offset), status in updates.items():
+            if offset < 0:
+                continue
+            # Pairs without bitmaps are loaded from the database on next read
+            _APPLY_SESSION(
+                keys=[_key(student_id, batch_id, kind) for kind in BITMAP_KINDS + ("generation",)],
+                args=[
+                    offset,
+                    int(status is not None),
+                    int(status == AttendanceStatus.PRESENT),
+                    int(status == AttendanceStatus.ABSENT),
+                    settings.ATTENDANCE_BITMAP_TTL_SECONDS
+                ],
+                client=pipe
+            )
+        pipe.execute()
+    except redis.RedisError as e:
+        # Stale bitmaps are repaired by scripts/rebuild_attendance_bitmaps.py
+        logger.warning(f"Attendance bitmap update failed: {e}")
+
+
+def _load_pair(db: Session, student_id: int, batch_id: int) -> Tuple[int, int, int]:
+    """Read one pair's attendance from the database and store its bitmaps"""
+    generation_key = _key(student_id, batch_id, "generation")
+    try:
+        generation = redis_binary_client.get(generation_key) or b"0"
+    except redis.RedisError as e:
+        logger.warning(f"Attendance bitmap read failed: {e}")
+        generation = None
+
+    rows = db.query(Attendance.date, Attendance.status, Batch.start_date).join(
+        Batch, Batch.id == Attendance.batch_id
+    ).filter(
+        Attendance.student_id == student_id,
+        Attendance.batch_id == batch_id
+    ).all()
+
+    # Same bit layout as Redis: offset 0 is the most significant bit
+    marked = present = absent = 0
+    size = max((session_number(start, day) for day, _, start in rows), default=-1) + 1
+    for attendance_date, status, batch_start in rows:
+        offset = session_number(batch_start, attendance_date)
+        if offset < 0:
+            continue
+        bit = 1 << (size - 1 - offset)
+        marked |= bit
+        if status == AttendanceStatus.PRESENT:
+            present |= bit
+        elif status == AttendanceStatus.ABSENT:
+            absent |= bit
+
+    # Rows this session flushed but has not committed may still roll back
+    uncommitted = any(
+        (pending_student, pending_batch) == (student_id, batch_id)
+        for pending_student, pending_batch, _ in db.info.get(_PENDING_KEY, ())
+    )
+    if generation is not None and not uncommitted:
+        # Pad to whole bytes; Redis reads bit 0 from the first byte's high bit
+        padding = -size % 8
+        try:
+            _STORE_PAIR(
+                keys=[_key(student_id, batch_id, kind) for kind in BITMAP_KINDS] + [generation_key],
+                args=[generation, settings.ATTENDANCE_BITMAP_TTL_SECONDS] + [
+                    (bits << padding).to_bytes((size + padding) // 8, "big")
+                    for bits in (marked, present, absent)
+                ]
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Attendance bitmap load failed: {e}")
+    return marked, present, absent
+
+
+def get_bitmaps(db: Session, student_id: int, batch_id: int) -> Tuple[int, int, int]:
+    """
+    Marked, present and absent bitmaps for a pair as integers whose least
+    significant bit is the latest possible session
+    """
+    try:
+        values = redis_binary_client.mget([_key(student_id, batch_id, kind) for kind in BITMAP_KINDS])
+    except redis.RedisError as e:
+        logger.warning(f"Attendance bitmap read failed: {e}")
+        values = [None] * len(BITMAP_KINDS)
+
+    if None in values:
+        return _load_pair(db, student_id, batch_id)
+
+    # Bitmaps can differ in length; pad to the longest so bits line up
+    size = max(len(value or b"") for value in values)
+    marked, present, absent = (
+        int.from_bytes((value or b"").ljust(size, b"\0"), "big") for value in values
+    )
+    return marked, present, absent
+
+
+def get_attendance_counts(db: Session, student_id: int, batch_ids: Iterable[int]) -> Dict[int, Tuple[int, int]]:
+    """(present, marked) session counts per batch using BITCOUNT"""
+    batch_ids = list(batch_ids)
+    try:
+        pipe = redis_binary_client.pipeline(transaction=False)
+        for batch_id in batch_ids:
+            pipe.exists(*(_key(student_id, batch_id, kind) for kind in BITMAP_KINDS))
+            pipe.bitcount(_key(student_id, batch_id, "present"))
+            pipe.bitcount(_key(student_id, batch_id, "marked"))
+        replies = pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Attendance bitmap read failed: {e}")
+        replies = [0, 0, 0] * len(batch_ids)
+
+    counts = {}
+    for index, batch_id in enumerate(batch_ids):
+        exists, present, marked = replies[index * 3:index * 3 + 3]
+        if exists < len(BITMAP_KINDS):
+            marked_bits, present_bits, _ = _load_pair(db, student_id, batch_id)
+            present, marked = bin(present_bits).count("1"), bin(marked_bits).count("1")
+        counts[batch_id] = (present, marked)
+    return counts
+
+
+def get_attendance_percentage(db: Session, student_id: int, batch_id: Optional[int] = None) -> float:
+    """
+    Attendance percentage for one batch or across all the student's batches
+    (Student.get_attendance_percentage, StudentBatch.get_attendance_percentage)
+    """
+    if batch_id is not None:
+        batch_ids = [batch_id]
+    else:
+        batch_ids = [
+            enrolled_batch_id for (enrolled_batch_id,) in
+            db.query(StudentBatch.batch_id).filter(StudentBatch.student_id == student_id)
+        ]
+
+    counts = get_attendance_counts(db, student_id, batch_ids).values()
+    present = sum(present for present, _ in counts)
+    marked = sum(marked for _, marked in counts)
+    return (present / marked) * 100 if marked else 0.0
+
+
+def get_present_streak(db: Session, student_id: int, batch_id: int) -> int:
+    """Number of most recent marked sessions the student attended in a row"""
+    marked, present, _ = get_bitmaps(db, student_id, batch_id)
+    streak = 0
+    while marked:
+        latest = marked & -marked
+        if not present & latest:
+            break
+        streak += 1
+        marked ^= latest
+    return streak
+
+
+def has_consecutive_absences(db: Session, student_id: int, batch_id: int, sessions: int) -> bool:
+    """Check whether the last `sessions` marked sessions were all absences"""
+    marked, _, absent = get_bitmaps(db, student_id, batch_id)
+    for _ in range(sessions):
+        if not marked:
+            return False
+        latest = marked & -marked
+        if not absent & latest:
+            return False
+        marked ^= latest
+    return True
+
+
+def rebuild(db: Session, batch_ids: Optional[Iterable[int]] = None) -> int:
+    """Rewrite bitmaps from the attendance table; returns the number of pairs rebuilt"""
+    query = db.query(
+        Attendance.student_id, Attendance.batch_id, Attendance.date, Attendance.status, Batch.start_date
+    ).join(Batch, Batch.id == Attendance.batch_id)
+    if batch_ids is not None:
+        query = query.filter(Attendance.batch_id.in_(list(batch_ids)))
+    rows = query.order_by(Attendance.student_id, Attendance.batch_id).yield_per(REBUILD_PIPELINE_SIZE)
+
+    pairs = 0
+    pipe = redis_binary_client.pipeline()
+    for (student_id, batch_id), pair_rows in groupby(rows, key=lambda row: (row[0], row[1])):
+        pipe.delete(*(_key(student_id, batch_id, kind) for kind in BITMAP_KINDS))
+        for _, _, attendance_date, status, batch_start in pair_rows:
+            _set_session(pipe, student_id, batch_id, session_number(batch_start, attendance_date), status)
+        for kind in BITMAP_KINDS:
+            pipe.expire(_key(student_id, batch_id, kind), settings.ATTENDANCE_BITMAP_TTL_SECONDS)
+        pairs += 1
+        if len(pipe) >= REBUILD_PIPELINE_SIZE:
+            pipe.execute()
+    pipe.execute()
+    return pairs
+
+
+# Track ORM attendance writes and publish them to Redis after commit
+
+@event.listens_for(Session, "after_flush")
+def _collect_attendance_changes(session, flush_context):
+    changes = [(obj, obj.status) for obj in session.new if isinstance(obj, Attendance)]
+    changes += [
+        (obj, obj.status) for obj in session.dirty
+        if isinstance(obj, Attendance) and inspect(obj).attrs.status.history.has_changes()
+    ]
+    changes += [(obj, None) for obj in session.deleted if isinstance(obj, Attendance)]
+
+    with session.no_autoflush:
+        for obj, status in changes:
+            batch = session.get(Batch, obj.batch_id)
+            if batch is not None and batch.start_date is not None:
+                queue_update(session, obj.student_id, obj.batch_id, batch.start_date, obj.date, status)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session):
+    # Also fired when a savepoint is released; the outer transaction can still roll back
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        _apply_updates(pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    # A failed savepoint keeps updates from earlier flushes
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
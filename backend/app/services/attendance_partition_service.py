@@ -0,0 +1,113 @@
+"""
+Maintenance of the monthly attendance partitions
+
+attendance is range-partitioned on date with one partition per calendar
+month named attendance_pYYYY_MM, plus attendance_default for rows outside
+every monthly range. Future months are created ahead of time; months past
+the retention window are detached and moved to an archive schema or
+dropped, which keeps vacuum and index maintenance on the live table bounded.
+"""
+
+import re
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import DatabaseError
+
+PARENT_TABLE = "attendance"
+DEFAULT_PARTITION = "attendance_default"
+PARTITION_NAME = re.compile(r"^attendance_p(\d{4})_(\d{2})$")
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after month"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Partition table name for a month"""
+    return f"attendance_p{month:%Y_%m}"
+
+
+def list_partitions(db: Session) -> Dict[date, str]:
+    """Attached monthly partitions by first day of month"""
+    rows = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": PARENT_TABLE})
+
+    partitions = {}
+    for (name,) in rows:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def count_default_rows(db: Session) -> int:
+    """Rows that fell outside every monthly partition"""
+    return db.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION}")).scalar()
+
+
+def create_partitions(db: Session, first_month: date, last_month: date) -> List[str]:
+    """Create any missing monthly partitions from first_month to last_month"""
+    existing = list_partitions(db)
+    created = []
+    month = first_month.replace(day=1)
+    while month <= last_month:
+        if month not in existing:
+            next_month = add_months(month, 1)
+            stranded = db.execute(text(
+                f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end"
+            ), {"start": month, "end": next_month}).scalar()
+            if stranded:
+                raise DatabaseError(
+                    f"{stranded} rows for {month:%Y-%m} are in {DEFAULT_PARTITION}; "
+                    "move them out before creating the partition",
+                    {"month": str(month), "rows": stranded}
+                )
+            db.execute(text(
+                f"CREATE TABLE {partition_name(month)} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ('{month}') TO ('{next_month}')"
+            ))
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def ensure_future_partitions(db: Session, months_ahead: int, today: Optional[date] = None) -> List[str]:
+    """Create partitions for the current month and the next months_ahead months"""
+    current_month = (today or date.today()).replace(day=1)
+    return create_partitions(db, current_month, add_months(current_month, months_ahead))
+
+
+def detach_old_partitions(
+    db: Session,
+    retention_months: int,
+    archive_schema: Optional[str] = None,
+    today: Optional[date] = None
+) -> List[str]:
+    """
+    Detach partitions older than the retention window; each is moved into
+    archive_schema, or dropped when no schema is given
+    """
+    cutoff = add_months((today or date.today()).replace(day=1), -retention_months)
+    if archive_schema:
+        db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+
+    detached = []
+    for month, name in sorted(list_partitions(db).items()):
+        if month >= cutoff:
+            break
+        db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        if archive_schema:
+            db.execute(text(f'ALTER TABLE {name} SET SCHEMA "{archive_schema}"'))
+        else:
+            db.execute(text(f"DROP TABLE {name}"))
+        detached.append(name)
+    return detached
@@ -0,0 +1,120 @@
+"""
+Daily attendance rollup queries and rebuild
+
+attendance_daily_rollup holds one row per batch and day, kept current by
+statement-level triggers on attendance. Dashboards aggregate these rows
+instead of the raw attendance table.
+"""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import extract, func, insert, literal, text
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.attendance_daily_rollup import AttendanceDailyRollup
+from app.models.batch import Batch
+
+COUNT_COLUMNS = ("present_count", "absent_count", "late_count", "excused_count")
+
+
+def _summary(present: int, absent: int, late: int, excused: int) -> Dict[str, float]:
+    total = present + absent + late + excused
+    return {
+        "present_count": present,
+        "absent_count": absent,
+        "late_count": late,
+        "excused_count": excused,
+        "total_count": total,
+        "attendance_percentage": (present / total) * 100 if total else 0.0
+    }
+
+
+def get_daily_attendance(
+    db: Session,
+    center_id: int,
+    date_range: Tuple[date, date],
+    batch_ids: Optional[Iterable[int]] = None
+) -> List[dict]:
+    """Attendance counts per day for a center, optionally limited to some batches"""
+    query = db.query(
+        AttendanceDailyRollup.date,
+        *(func.sum(getattr(AttendanceDailyRollup, column)) for column in COUNT_COLUMNS)
+    ).filter(
+        AttendanceDailyRollup.center_id == center_id,
+        AttendanceDailyRollup.date.between(date_range[0], date_range[1])
+    )
+    if batch_ids is not None:
+        query = query.filter(AttendanceDailyRollup.batch_id.in_(list(batch_ids)))
+
+    return [
+        {"date": day, **_summary(*counts)}
+        for day, *counts in query.group_by(AttendanceDailyRollup.date).order_by(AttendanceDailyRollup.date)
+    ]
+
+
+def get_monthly_attendance(db: Session, center_id: int, year: int) -> List[dict]:
+    """Attendance counts per month of a year for a center"""
+    month = extract("month", AttendanceDailyRollup.date)
+    query = db.query(
+        month,
+        *(func.sum(getattr(AttendanceDailyRollup, column)) for column in COUNT_COLUMNS)
+    ).filter(
+        AttendanceDailyRollup.center_id == center_id,
+        AttendanceDailyRollup.date.between(date(year, 1, 1), date(year, 12, 31))
+    ).group_by(month).order_by(month)
+
+    return [
+        {"year": year, "month": int(month_number), **_summary(*counts)}
+        for month_number, *counts in query
+    ]
+
+
+def rebuild(
+    db: Session,
+    date_range: Optional[Tuple[date, date]] = None,
+    batch_ids: Optional[Iterable[int]] = None
+) -> int:
+    """
+    Recompute rollup rows from the attendance table; returns the number of
+    rows written. Attendance writes are blocked until the caller commits.
+    """
+    db.execute(text("LOCK TABLE attendance IN SHARE MODE"))
+
+    delete_query = db.query(AttendanceDailyRollup)
+    if date_range:
+        delete_query = delete_query.filter(AttendanceDailyRollup.date.between(date_range[0], date_range[1]))
+    if batch_ids is not None:
+        batch_ids = list(batch_ids)
+        delete_query = delete_query.filter(AttendanceDailyRollup.batch_id.in_(batch_ids))
+    delete_query.delete(synchronize_session=False)
+
+    now = datetime.utcnow()
+    source = db.query(
+        Attendance.batch_id,
+        Batch.center_id,
+        Attendance.date,
+        *(
+            func.count().filter(Attendance.status == status)
+            for status in (
+                AttendanceStatus.PRESENT, AttendanceStatus.ABSENT,
+                AttendanceStatus.LATE, AttendanceStatus.EXCUSED
+            )
+        ),
+        literal(now),
+        literal(now)
+    ).join(Batch, Batch.id == Attendance.batch_id)
+    if date_range:
+        source = source.filter(Attendance.date.between(date_range[0], date_range[1]))
+    if batch_ids is not None:
+        source = source.filter(Attendance.batch_id.in_(batch_ids))
+    source = source.group_by(Attendance.batch_id, Batch.center_id, Attendance.date)
+
+    result = db.execute(
+        insert(AttendanceDailyRollup).from_select(
+            ["batch_id", "center_id", "date", *COUNT_COLUMNS, "created_at", "updated_at"],
+            source.statement
+        )
+    )
+    return result.rowcount
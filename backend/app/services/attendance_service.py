@@ -0,0 +1,147 @@
+"""
+Attendance write path
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import (
+    AttendanceAlreadyMarkedError,
+    InvalidAttendanceDateError,
+    ValidationError
+)
+from app.models.attendance import Attendance
+from app.models.batch import Batch
+from app.models.student_batch import StudentBatch, StudentBatchStatus
+from app.services import attendance_bitmap_service
+
+UNIQUE_MARKING_CONSTRAINT = "uq_attendance_student_batch_date"
+UNIQUE_VIOLATION = "23505"
+
+
+def save_attendance(db: Session, attendance: Attendance) -> Attendance:
+    """
+    Insert a single attendance record
+
+    Relies on the (student_id, batch_id, date) unique constraint instead of
+    a read-before-write check, and reports a duplicate as
+    AttendanceAlreadyMarkedError without discarding the rest of the session.
+    """
+    try:
+        with db.begin_nested():
+            db.add(attendance)
+    except IntegrityError as e:
+        # Violations are reported under the partition's own constraint name;
+        # the only other unique key is the sequence-backed primary key
+        if getattr(e.orig, "pgcode", None) == UNIQUE_VIOLATION:
+            raise AttendanceAlreadyMarkedError(attendance.student_id, str(attendance.date))
+        raise
+    return attendance
+
+
+
+def mark_session_attendance(
+    db: Session,
+    batch: Batch,
+    session_date: date,
+    entries: List[Any],
+    faculty_id: int,
+    topic_covered: Optional[str] = None,
+    restrict_to_faculty: bool = False
+) -> Dict[str, Any]:
+    """
+    Mark attendance for a batch roster in one session
+
+    All valid entries are written with a single INSERT ... ON CONFLICT DO
+    UPDATE on the (student_id, batch_id, date) constraint. When
+    restrict_to_faculty is set, existing records marked by another faculty
+    member are left untouched, matching Attendance.can_be_modified.
+    """
+    if session_date > date.today():
+        raise InvalidAttendanceDateError(str(session_date), "date is in the future")
+    if session_date < batch.start_date:
+        raise InvalidAttendanceDateError(str(session_date), "date is before the batch start date")
+
+    student_ids = [entry.student_id for entry in entries]
+    if len(set(student_ids)) != len(student_ids):
+        raise ValidationError("Each student may appear only once per session")
+
+    enrolled = {
+        student_id for (student_id,) in db.query(StudentBatch.student_id).filter(
+            StudentBatch.batch_id == batch.id,
+            StudentBatch.status == StudentBatchStatus.ACTIVE,
+            StudentBatch.student_id.in_(student_ids)
+        )
+    }
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "student_id": entry.student_id,
+            "batch_id": batch.id,
+            "faculty_id": faculty_id,
+            "date": session_date,
+            "status": entry.status,
+            "topic_covered": topic_covered,
+            "remarks": entry.remarks,
+            "marked_at": now,
+            "created_at": now,
+            "updated_at": now
+        }
+        for entry in entries
+        if entry.student_id in enrolled
+    ]
+
+    written = {}
+    if rows:
+        stmt = pg_insert(Attendance).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            constraint=UNIQUE_MARKING_CONSTRAINT,
+            set_={
+                "status": stmt.excluded.status,
+                "remarks": stmt.excluded.remarks,
+                "topic_covered": stmt.excluded.topic_covered,
+                "faculty_id": stmt.excluded.faculty_id,
+                "marked_at": stmt.excluded.marked_at,
+                "updated_at": stmt.excluded.updated_at
+            },
+            where=(Attendance.faculty_id == faculty_id) if restrict_to_faculty else None
+        ).returning(
+            Attendance.id,
+            Attendance.student_id,
+            # xmax is 0 only for freshly inserted row versions
+            literal_column("(xmax = 0)").label("inserted")
+        )
+        written = {row.student_id: row for row in db.execute(stmt)}
+
+    # Core inserts bypass the ORM flush events that maintain the bitmaps
+    for entry in entries:
+        if entry.student_id in written:
+            attendance_bitmap_service.queue_update(
+                db, entry.student_id, batch.id, batch.start_date, session_date, entry.status
+            )
+
+    results = []
+    counts = {"created": 0, "updated": 0, "rejected": 0}
+    for entry in entries:
+        row = written.get(entry.student_id)
+        if entry.student_id not in enrolled:
+            result = {"result": "rejected", "error": "Student is not actively enrolled in this batch"}
+        elif row is None:
+            result = {"result": "rejected", "error": "Attendance was marked by another faculty member"}
+        else:
+            result = {"result": "created" if row.inserted else "updated", "attendance_id": row.id}
+        counts[result["result"]] += 1
+        results.append({"student_id": entry.student_id, "status": entry.status, **result})
+
+    return {
+        "batch_id": batch.id,
+        "date": session_date,
+        **counts,
+        "results": results
+    }
@@ -0,0 +1,329 @@
+"""
+Generation and batch evaluation of faculty performance records
+
+Scores every FacultyPerformance row of an evaluation period at once: the
+metric columns are loaded into a NumPy matrix, weighted scores, grades,
+levels, strengths and improvement areas are derived with array operations,
+and overall_score is written back with a single UPDATE ... FROM (VALUES ...).
+Results are identical to FacultyPerformance.calculate_overall_score,
+get_performance_grade, get_performance_level, get_strengths and
+get_improvement_areas.
+
+generate_center_performance derives a month's metrics for every faculty
+member of a center from a handful of grouped queries and upserts them; the
+nightly Celery pipeline in app.tasks runs it once per center.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import Integer, Numeric, and_, column, distinct, func, or_, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.attendance_daily_rollup import AttendanceDailyRollup
+from app.models.batch import Batch
+from app.models.batch_topic import BatchTopic, BatchTopicStatus
+from app.models.faculty import Faculty
+from app.models.faculty_performance import FacultyPerformance
+from app.models.feedback import Feedback
+from app.models.student_batch import StudentBatch, StudentBatchStatus
+from app.models.user import User, UserRole
+from app.services import faculty_ranking_service
+
+UNIQUE_PERIOD_CONSTRAINT = "uq_faculty_performance_faculty_id_period"
+
+# Matrix column order for the metrics the score is built from
+METRIC_COLUMNS = (
+    "average_completion_rate",
+    "average_feedback_rating",
+    "attendance_percentage",
+    "punctuality_score",
+    "syllabus_coverage_percentage",
+)
+COMPLETION, FEEDBACK, ATTENDANCE, PUNCTUALITY, SYLLABUS = range(len(METRIC_COLUMNS))
+
+SCORE_WEIGHTS = (0.25, 0.25, 0.20, 0.15, 0.15)
+
+GRADE_THRESHOLDS = ((90, "A+"), (80, "A"), (70, "B"), (60, "C"), (50, "D"))
+LEVEL_THRESHOLDS = ((90, "Outstanding"), (80, "Excellent"), (70, "Good"), (60, "Average"), (50, "Below Average"))
+
+STRENGTH_LABELS = (
+    "High student completion rate",
+    "Excellent student feedback",
+    "High student attendance",
+    "Excellent punctuality",
+    "Complete syllabus coverage",
+)
+STRENGTH_THRESHOLDS = np.array([80, 4.0, 90, 90, 90])
+
+IMPROVEMENT_LABELS = (
+    "Student completion rate",
+    "Student feedback ratings",
+    "Student attendance",
+    "Punctuality",
+    "Syllabus coverage",
+)
+IMPROVEMENT_THRESHOLDS = np.array([60, 3.0, 85, 85, 80])
+
+
+def metric_matrix(rows: List[tuple]) -> np.ndarray:
+    """Metric rows (None for missing) as an n x 5 float matrix with missing values as 0"""
+    if not rows:
+        return np.zeros((0, len(METRIC_COLUMNS)))
+    matrix = np.array(rows, dtype=float)
+    return np.nan_to_num(matrix, nan=0.0)
+
+
+def calculate_overall_scores(metrics: np.ndarray) -> List[float]:
+    """Weighted overall score per row, rounded like calculate_overall_score"""
+    scores = (
+        metrics[:, COMPLETION] * SCORE_WEIGHTS[COMPLETION]
+        + (metrics[:, FEEDBACK] / 5) * 100 * SCORE_WEIGHTS[FEEDBACK]
+        + metrics[:, ATTENDANCE] * SCORE_WEIGHTS[ATTENDANCE]
+        + metrics[:, PUNCTUALITY] * SCORE_WEIGHTS[PUNCTUALITY]
+        + metrics[:, SYLLABUS] * SCORE_WEIGHTS[SYLLABUS]
+    )
+    # np.round scales and truncates, which can differ from Python's correctly
+    # rounded round() in the last digit
+    return [round(score, 2) for score in scores.tolist()]
+
+
+def _classify(scores: np.ndarray, thresholds: tuple, default: str) -> List[str]:
+    labels = np.select(
+        [scores >= threshold for threshold, _ in thresholds],
+        [label for _, label in thresholds],
+        default=default
+    )
+    return labels.tolist()
+
+
+def get_performance_grades(scores: np.ndarray) -> List[str]:
+    """Grade per score (get_performance_grade)"""
+    return _classify(scores, GRADE_THRESHOLDS, "F")
+
+
+def get_performance_levels(scores: np.ndarray) -> List[str]:
+    """Level description per score (get_performance_level)"""
+    return _classify(scores, LEVEL_THRESHOLDS, "Poor")
+
+
+def _flag_labels(flags: np.ndarray, labels: tuple) -> List[List[str]]:
+    return [[labels[index] for index in np.flatnonzero(row)] for row in flags]
+
+
+def get_strengths(metrics: np.ndarray) -> List[List[str]]:
+    """Strengths per row (get_strengths)"""
+    return _flag_labels(metrics >= STRENGTH_THRESHOLDS, STRENGTH_LABELS)
+
+
+def get_improvement_areas(metrics: np.ndarray) -> List[List[str]]:
+    """Improvement areas per row (get_improvement_areas)"""
+    return _flag_labels(metrics < IMPROVEMENT_THRESHOLDS, IMPROVEMENT_LABELS)
+
+
+def evaluate_period(db: Session, evaluation_period: str, save: bool = True) -> List[Dict]:
+    """
+    Score every performance record of an evaluation period; overall_score is
+    stored with one bulk UPDATE unless save is False
+    """
+    rows = db.query(
+        FacultyPerformance.id,
+        FacultyPerformance.faculty_id,
+        *(getattr(FacultyPerformance, name) for name in METRIC_COLUMNS)
+    ).filter(
+        FacultyPerformance.evaluation_period == evaluation_period
+    ).order_by(FacultyPerformance.id).all()
+    if not rows:
+        return []
+
+    metrics = metric_matrix([row[2:] for row in rows])
+    scores = calculate_overall_scores(metrics)
+    score_array = np.array(scores)
+    grades = get_performance_grades(score_array)
+    levels = get_performance_levels(score_array)
+    strengths = get_strengths(metrics)
+    improvement_areas = get_improvement_areas(metrics)
+
+    if save:
+        new_scores = values(
+            column("id", Integer), column("overall_score", Numeric(5, 2)), name="new_scores"
+        ).data([(row.id, score) for row, score in zip(rows, scores)])
+        db.execute(
+            update(FacultyPerformance)
+            .where(FacultyPerformance.id == new_scores.c.id)
+            .values(overall_score=new_scores.c.overall_score)
+            .execution_options(synchronize_session=False)
+        )
+        faculty_ranking_service.queue_invalidation(db, evaluation_period)
+
+    return [
+        {
+            "id": row.id,
+            "faculty_id": row.faculty_id,
+            "evaluation_period": evaluation_period,
+            "overall_score": scores[index],
+            "grade": grades[index],
+            "level": levels[index],
+            "strengths": strengths[index],
+            "improvement_areas": improvement_areas[index]
+        }
+        for index, row in enumerate(rows)
+    ]
+
+
+
+def period_bounds(evaluation_period: str) -> Tuple[date, date]:
+    """First and last day of a monthly evaluation period ('YYYY-MM')"""
+    start = datetime.strptime(evaluation_period, "%Y-%m").date()
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return start, end
+
+
+def _percentage(part, whole):
+    return round(float(part) / float(whole) * 100, 2) if whole else None
+
+
+def compute_center_metrics(db: Session, center_id: int, evaluation_period: str) -> List[Dict]:
+    """
+    Monthly metrics for every faculty member of a center, one grouped query
+    per metric family
+    """
+    start, end = period_bounds(evaluation_period)
+    # faculty_performance.faculty_id references faculty.user_id, so users
+    # without a Faculty profile cannot have records
+    faculty_ids = [
+        user_id for (user_id,) in db.query(User.id).join(
+            Faculty, Faculty.user_id == User.id
+        ).filter(
+            User.center_id == center_id,
+            User.role == UserRole.FACULTY
+        ).order_by(User.id)
+    ]
+    if not faculty_ids:
+        return []
+
+    batch_in_period = and_(
+        Batch.faculty_id.in_(faculty_ids),
+        Batch.start_date <= end,
+        or_(Batch.end_date.is_(None), Batch.end_date >= start)
+    )
+
+    students = {
+        faculty_id: (taught, completed)
+        for faculty_id, taught, completed in db.query(
+            Batch.faculty_id,
+            func.count(distinct(StudentBatch.student_id)),
+            func.count(distinct(StudentBatch.student_id)).filter(
+                StudentBatch.status == StudentBatchStatus.COMPLETED,
+                StudentBatch.completion_date <= end
+            )
+        ).select_from(StudentBatch).join(Batch, Batch.id == StudentBatch.batch_id).filter(
+            batch_in_period
+        ).group_by(Batch.faculty_id)
+    }
+
+    feedback = dict(db.query(
+        Feedback.faculty_id,
+        func.avg(Feedback.rating)
+    ).filter(
+        Feedback.faculty_id.in_(faculty_ids),
+        Feedback.created_at >= start,
+        Feedback.created_at < end + timedelta(days=1)
+    ).group_by(Feedback.faculty_id).all())
+
+    # Classes and attendance come from the daily rollup, not raw attendance
+    recorded = (
+        AttendanceDailyRollup.present_count + AttendanceDailyRollup.absent_count
+        + AttendanceDailyRollup.late_count + AttendanceDailyRollup.excused_count
+    )
+    attendance = {
+        faculty_id: (classes, present, total)
+        for faculty_id, classes, present, total in db.query(
+            Batch.faculty_id,
+            func.count(AttendanceDailyRollup.id).filter(recorded > 0),
+            func.sum(AttendanceDailyRollup.present_count),
+            func.sum(recorded)
+        ).select_from(AttendanceDailyRollup).join(Batch, Batch.id == AttendanceDailyRollup.batch_id).filter(
+            Batch.faculty_id.in_(faculty_ids),
+            AttendanceDailyRollup.date.between(start, end)
+        ).group_by(Batch.faculty_id)
+    }
+
+    syllabus = {
+        faculty_id: (total, completed)
+        for faculty_id, total, completed in db.query(
+            Batch.faculty_id,
+            func.count(BatchTopic.id),
+            func.count(BatchTopic.id).filter(
+                BatchTopic.status == BatchTopicStatus.COMPLETED,
+                or_(BatchTopic.completed_date.is_(None), BatchTopic.completed_date <= end)
+            )
+        ).select_from(BatchTopic).join(Batch, Batch.id == BatchTopic.batch_id).filter(
+            batch_in_period
+        ).group_by(Batch.faculty_id)
+    }
+
+    metrics = []
+    for faculty_id in faculty_ids:
+        taught, completed = students.get(faculty_id, (0, 0))
+        classes, present, recorded_total = attendance.get(faculty_id, (0, 0, 0))
+        topics, topics_completed = syllabus.get(faculty_id, (0, 0))
+        average_rating = feedback.get(faculty_id)
+        metrics.append({
+            "faculty_id": faculty_id,
+            "evaluation_period": evaluation_period,
+            "total_students_taught": taught,
+            "students_completed": completed,
+            "average_completion_rate": _percentage(completed, taught),
+            "average_feedback_rating": round(float(average_rating), 2) if average_rating is not None else None,
+            "total_classes_taken": classes,
+            "attendance_percentage": _percentage(present, recorded_total),
+            "syllabus_coverage_percentage": _percentage(topics_completed, topics)
+        })
+    return metrics
+
+
+def generate_center_performance(db: Session, center_id: int, evaluation_period: str) -> int:
+    """
+    Compute, score and upsert a month's performance records for a center's
+    faculty; safe to re-run. Returns the number of records written.
+    """
+    rows = compute_center_metrics(db, center_id, evaluation_period)
+    if not rows:
+        return 0
+
+    # punctuality_score has no source yet and is left untouched, but an
+    # existing value still counts towards the score like it does in
+    # FacultyPerformance.calculate_overall_score
+    punctuality = dict(db.query(
+        FacultyPerformance.faculty_id,
+        FacultyPerformance.punctuality_score
+    ).filter(
+        FacultyPerformance.faculty_id.in_([row["faculty_id"] for row in rows]),
+        FacultyPerformance.evaluation_period == evaluation_period
+    ).all())
+    scores = calculate_overall_scores(metric_matrix([
+        tuple(
+            punctuality.get(row["faculty_id"]) if name == "punctuality_score" else row.get(name)
+            for name in METRIC_COLUMNS
+        )
+        for row in rows
+    ]))
+    now = datetime.utcnow()
+    for row, score in zip(rows, scores):
+        row.update(overall_score=score, created_at=now, updated_at=now)
+
+    stmt = pg_insert(FacultyPerformance).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        constraint=UNIQUE_PERIOD_CONSTRAINT,
+        set_={
+            name: stmt.excluded[name]
+            for name in rows[0]
+            if name not in ("faculty_id", "evaluation_period", "created_at")
+        }
+    )
+    db.execute(stmt)
+    faculty_ranking_service.queue_invalidation(db, evaluation_period)
+    return len(rows)
\ No newline at end of file
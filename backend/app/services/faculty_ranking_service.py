@@ -0,0 +1,169 @@
+"""
+Faculty performance ranking by evaluation period
+
+Percentiles follow PERCENT_RANK semantics: the share of other scored
+records in the period with a strictly lower overall score, so tied scores
+always share a percentile. Single lookups bisect a sorted score list cached
+per period; ranking everyone uses the PERCENT_RANK window function.
+
+Cached lists carry a per-period version number kept in Redis. Score changes
+bump it after commit, so every worker rebuilds on its next lookup.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+import redis
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import redis_client
+from app.models.faculty_performance import FacultyPerformance
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_PREFIX = "faculty:ranking:version:"
+
+_PENDING_KEY = "faculty_ranking_invalidations"
+
+
+class PeriodScoreCache:
+    """
+    Sorted overall scores per evaluation period, validated against Redis
+    """
+
+    def __init__(self, ttl: int):
+        self._ttl = ttl
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _version(period: str) -> Optional[str]:
+        try:
+            return redis_client.get(f"{VERSION_KEY_PREFIX}{period}") or "0"
+        except redis.RedisError as e:
+            logger.warning(f"Ranking version lookup failed: {e}")
+            return None
+
+    def get(self, db: Session, period: str) -> List[float]:
+        """Ascending overall scores for the period"""
+        version = self._version(period)
+        with self._lock:
+            entry = self._entries.get(period)
+        if entry is not None:
+            cached_version, expires_at, scores = entry
+            if version is not None and cached_version == version and expires_at > time.monotonic():
+                return scores
+
+        scores = [
+            float(score) for (score,) in db.query(FacultyPerformance.overall_score).filter(
+                FacultyPerformance.evaluation_period == period,
+                FacultyPerformance.overall_score.isnot(None)
+            ).order_by(FacultyPerformance.overall_score)
+        ]
+        if version is not None:
+            with self._lock:
+                self._entries[period] = (version, time.monotonic() + self._ttl, scores)
+        return scores
+
+    def invalidate(self, *periods: str):
+        """Bump the version of each period so every worker rebuilds"""
+        with self._lock:
+            for period in periods:
+                self._entries.pop(period, None)
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for period in periods:
+                pipe.incr(f"{VERSION_KEY_PREFIX}{period}")
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Ranking invalidation failed: {e}")
+
+
+period_scores = PeriodScoreCache(ttl=settings.FACULTY_RANKING_CACHE_TTL_SECONDS)
+
+
+def percentile_for_score(scores: List[float], score) -> float:
+    """PERCENT_RANK of score within ascending scores, as a percentage"""
+    if score is None or len(scores) < 2:
+        return 0.0
+    lower = bisect_left(scores, float(score))
+    return round(lower / (len(scores) - 1) * 100, 2)
+
+
+def get_ranking_percentile(db: Session, evaluation_period: str, score) -> float:
+    """Percentile of a score within its evaluation period in O(log n)"""
+    return percentile_for_score(period_scores.get(db, evaluation_period), score)
+
+
+def rank_period(db: Session, evaluation_period: str) -> List[Dict]:
+    """Rank and percentile of every scored record in a period in one query"""
+    rows = db.query(
+        FacultyPerformance.id,
+        FacultyPerformance.faculty_id,
+        FacultyPerformance.overall_score,
+        func.rank().over(order_by=FacultyPerformance.overall_score.desc()),
+        func.percent_rank().over(order_by=FacultyPerformance.overall_score)
+    ).filter(
+        FacultyPerformance.evaluation_period == evaluation_period,
+        FacultyPerformance.overall_score.isnot(None)
+    ).order_by(FacultyPerformance.overall_score.desc(), FacultyPerformance.faculty_id)
+
+    return [
+        {
+            "id": performance_id,
+            "faculty_id": faculty_id,
+            "overall_score": float(score),
+            "rank": rank,
+            "percentile": round(percent_rank * 100, 2)
+        }
+        for performance_id, faculty_id, score, rank, percent_rank in rows
+    ]
+
+
+def queue_invalidation(session: Session, *periods: str):
+    """Invalidate cached rankings for periods once the session commits"""
+    session.info.setdefault(_PENDING_KEY, set()).update(periods)
+
+
+# Invalidate cached rankings when ORM writes change scores. Bulk updates
+# must call queue_invalidation() themselves.
+
+@event.listens_for(Session, "before_flush")
+def _collect_score_changes(session, flush_context, instances):
+    periods = set()
+    for obj in session.new:
+        if isinstance(obj, FacultyPerformance):
+            periods.add(obj.evaluation_period)
+    for obj in session.dirty:
+        if not isinstance(obj, FacultyPerformance):
+            continue
+        state = inspect(obj)
+        if state.attrs.overall_score.history.has_changes() or state.attrs.evaluation_period.history.has_changes():
+            periods.update(state.attrs.evaluation_period.history.sum())
+    for obj in session.deleted:
+        if isinstance(obj, FacultyPerformance):
+            periods.add(obj.evaluation_period)
+    if periods:
+        queue_invalidation(session, *periods)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    # Skip savepoint releases; the enclosing transaction decides
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        period_scores.invalidate(*pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    # A failed savepoint keeps invalidations from earlier flushes
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
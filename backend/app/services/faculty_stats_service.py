@@ -0,0 +1,116 @@
+"""
+Set-based faculty aggregates
+
+Query-level equivalents of the Faculty aggregate methods. Each metric is a
+single grouped query over any number of faculty members instead of walking
+batches, student_batches, received_feedback and attendance_records per
+object.
+"""
+
+from typing import Dict, Iterable
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance
+from app.models.batch import Batch, BatchStatus
+from app.models.feedback import Feedback
+from app.models.student_batch import StudentBatch, StudentBatchStatus
+
+# Faculty.get_workload_percentage assumes at most five active batches
+MAX_ACTIVE_BATCHES = 5
+
+
+def get_student_counts(db: Session, faculty_ids: Iterable[int]) -> Dict[int, tuple]:
+    """
+    (students taught, students completed) per faculty member
+    (Faculty.get_total_students_taught, Faculty.get_completed_students_count)
+    """
+    faculty_ids = list(faculty_ids)
+    rows = {
+        faculty_id: (taught, completed)
+        for faculty_id, taught, completed in db.query(
+            Batch.faculty_id,
+            func.count(StudentBatch.id),
+            func.count(StudentBatch.id).filter(
+                Batch.status == BatchStatus.COMPLETED,
+                StudentBatch.status == StudentBatchStatus.COMPLETED
+            )
+        ).select_from(StudentBatch).join(Batch, Batch.id == StudentBatch.batch_id).filter(
+            Batch.faculty_id.in_(faculty_ids)
+        ).group_by(Batch.faculty_id)
+    }
+    return {faculty_id: rows.get(faculty_id, (0, 0)) for faculty_id in faculty_ids}
+
+
+def get_average_feedback_ratings(db: Session, faculty_ids: Iterable[int]) -> Dict[int, float]:
+    """Average feedback rating per faculty member (Faculty.get_average_feedback_rating)"""
+    faculty_ids = list(faculty_ids)
+    rows = {
+        faculty_id: (total, count)
+        for faculty_id, total, count in db.query(
+            Feedback.faculty_id,
+            func.sum(Feedback.rating),
+            func.count(Feedback.id)
+        ).filter(Feedback.faculty_id.in_(faculty_ids)).group_by(Feedback.faculty_id)
+    }
+
+    ratings = {}
+    for faculty_id in faculty_ids:
+        total, count = rows.get(faculty_id, (0, 0))
+        ratings[faculty_id] = total / count if count else 0.0
+    return ratings
+
+
+def get_workload_percentages(db: Session, faculty_ids: Iterable[int]) -> Dict[int, float]:
+    """Active batches as a share of capacity per faculty member (Faculty.get_workload_percentage)"""
+    faculty_ids = list(faculty_ids)
+    active = dict(db.query(
+        Batch.faculty_id,
+        func.count(Batch.id)
+    ).filter(
+        Batch.faculty_id.in_(faculty_ids),
+        Batch.status == BatchStatus.ACTIVE
+    ).group_by(Batch.faculty_id).all())
+    return {
+        faculty_id: (active.get(faculty_id, 0) / MAX_ACTIVE_BATCHES) * 100
+        for faculty_id in faculty_ids
+    }
+
+
+def get_total_classes_taken(db: Session, faculty_ids: Iterable[int]) -> Dict[int, int]:
+    """Attendance records marked per faculty member (Faculty.get_total_classes_taken)"""
+    faculty_ids = list(faculty_ids)
+    counts = dict(db.query(
+        Attendance.faculty_id,
+        func.count(Attendance.id)
+    ).filter(Attendance.faculty_id.in_(faculty_ids)).group_by(Attendance.faculty_id).all())
+    return {faculty_id: counts.get(faculty_id, 0) for faculty_id in faculty_ids}
+
+
+def get_faculty_stats(db: Session, faculty_ids: Iterable[int]) -> Dict[int, dict]:
+    """All faculty aggregates for many faculty members in four grouped queries"""
+    faculty_ids = list(faculty_ids)
+    students = get_student_counts(db, faculty_ids)
+    ratings = get_average_feedback_ratings(db, faculty_ids)
+    workload = get_workload_percentages(db, faculty_ids)
+    classes = get_total_classes_taken(db, faculty_ids)
+
+    stats = {}
+    for faculty_id in faculty_ids:
+        taught, completed = students[faculty_id]
+        stats[faculty_id] = {
+            "faculty_id": faculty_id,
+            "total_students_taught": taught,
+            "completed_students_count": completed,
+            "completion_rate": (completed / taught) * 100 if taught else 0.0,
+            "average_feedback_rating": ratings[faculty_id],
+            "workload_percentage": workload[faculty_id],
+            "total_classes_taken": classes[faculty_id]
+        }
+    return stats
+
+
+def get_faculty_member_stats(db: Session, faculty_id: int) -> dict:
+    """All faculty aggregates for one faculty member"""
+    return get_faculty_stats(db, [faculty_id])[faculty_id]
@@ -0,0 +1,267 @@
+"""
+Unread notification counters in Redis
+
+Each user has one hash, notifications:unread:<user_id>, holding the total
+unread count and one field per NotificationCategory, so the unread badge
+is a single HGETALL instead of a COUNT over notifications.
+
+Counters are derived data. Creation, mark_as_read/mark_as_unread and
+deletes through the ORM are picked up by session events, and the outbox
+fan-out and bulk updates call queue_change()/queue_invalidation(); either
+way Redis is updated only after the transaction commits. A script applies
+each change atomically and only to hashes that already exist, so a missing
+hash is never left partially filled; it is rebuilt from the database on
+the next read. Changes that find no hash bump the user's generation key,
+and a rebuild only stores its counts if the generation is unchanged and no
+other reader stored them first. reconcile() periodically recounts the
+hashes that exist to correct any drift.
+"""
+
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+import redis
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import redis_client
+from app.models.notification import Notification, NotificationCategory
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "notifications:unread:"
+GENERATION_PREFIX = "notifications:unread_generation:"  # outside KEY_PREFIX so reconcile() skips it
+TOTAL_FIELD = "total"
+RECONCILE_BATCH_SIZE = 500
+
+_PENDING_KEY = "notification_unread_changes"
+_INVALIDATED_KEY = "notification_unread_invalidations"
+
+# KEYS = counter hash, generation; ARGV = generation TTL, field, delta, field, delta, ...
+_APPLY_DELTAS = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('INCR', KEYS[2])
+    redis.call('EXPIRE', KEYS[2], ARGV[1])
+    return 0
+end
+for i = 2, #ARGV, 2 do
+    if redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1]) < 0 then
+        redis.call('HSET', KEYS[1], ARGV[i], 0)
+    end
+end
+return 1
+""")
+
+# KEYS = counter hash, generation; ARGV = generation read before counting,
+# TTL, field, count, field, count, ...
+_STORE_COUNTS = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+for i = 3, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+""")
+
+
+def _key(user_id: int) -> str:
+    return f"{KEY_PREFIX}{user_id}"
+
+
+def _generation_key(user_id: int) -> str:
+    return f"{GENERATION_PREFIX}{user_id}"
+
+
+def _empty_counts() -> Dict[str, int]:
+    counts = {TOTAL_FIELD: 0}
+    counts.update({category.value: 0 for category in NotificationCategory})
+    return counts
+
+
+def count_unread(db: Session, user_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    """Unread counts per user and category from the database"""
+    user_ids = list(user_ids)
+    counts = {user_id: _empty_counts() for user_id in user_ids}
+    query = db.query(
+        Notification.user_id,
+        Notification.category,
+        func.count(Notification.id)
+    ).filter(
+        Notification.user_id.in_(user_ids),
+        Notification.is_read == False  # noqa: E712
+    ).group_by(Notification.user_id, Notification.category)
+
+    for user_id, category, count in query:
+        counts[user_id][NotificationCategory(category).value] = count
+        counts[user_id][TOTAL_FIELD] += count
+    return counts
+
+
+def _store(pipe, user_id: int, counts: Dict[str, int]):
+    pipe.delete(_key(user_id))
+    pipe.hset(_key(user_id), mapping=counts)
+    pipe.expire(_key(user_id), settings.NOTIFICATION_UNREAD_TTL_SECONDS)
+
+
+def get_unread_counts(db: Session, user_id: int) -> Dict[str, int]:
+    """Total and per-category unread counts for a user"""
+    key = _key(user_id)
+    try:
+        pipe = redis_client.pipeline()
+        pipe.hgetall(key)
+        pipe.expire(key, settings.NOTIFICATION_UNREAD_TTL_SECONDS)
+        pipe.get(_generation_key(user_id))
+        cached, _, generation = pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Unread counter read failed: {e}")
+        return count_unread(db, [user_id])[user_id]
+
+    if cached:
+        counts = _empty_counts()
+        counts.update({field: int(value) for field, value in cached.items()})
+        return counts
+
+    counts = count_unread(db, [user_id])[user_id]
+
+    # Changes this session flushed but has not committed may still roll back
+    uncommitted = user_id in db.info.get(_INVALIDATED_KEY, ()) or any(
+        pending_user == user_id and delta
+        for (pending_user, _), delta in db.info.get(_PENDING_KEY, {}).items()
+    )
+    if not uncommitted:
+        args = [generation or "0", settings.NOTIFICATION_UNREAD_TTL_SECONDS]
+        for field, count in counts.items():
+            args += [field, count]
+        try:
+            _STORE_COUNTS(keys=[key, _generation_key(user_id)], args=args)
+        except redis.RedisError as e:
+            logger.warning(f"Unread counter write failed: {e}")
+    return counts
+
+
+def queue_change(session: Session, user_id: int, category: NotificationCategory, delta: int):
+    """Record an unread count change to apply once the session commits"""
+    pending = session.info.setdefault(_PENDING_KEY, Counter())
+    pending[(user_id, NotificationCategory(category).value)] += delta
+
+
+def queue_invalidation(session: Session, *user_ids: int):
+    """Drop users' counters after commit, e.g. after a bulk Query.update()"""
+    session.info.setdefault(_INVALIDATED_KEY, set()).update(user_ids)
+
+
+def _apply_changes(changes: Dict[Tuple[int, str], int], invalidated: Iterable[int]):
+    by_user: Dict[int, List] = defaultdict(list)
+    for (user_id, category), delta in changes.items():
+        if delta:
+            by_user[user_id] += [category, delta, TOTAL_FIELD, delta]
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for user_id, args in by_user.items():
+            _APPLY_DELTAS(
+                keys=[_key(user_id), _generation_key(user_id)],
+                args=[settings.NOTIFICATION_UNREAD_TTL_SECONDS] + args,
+                client=pipe
+            )
+        invalidated = list(invalidated)
+        if invalidated:
+            pipe.delete(*(_key(user_id) for user_id in invalidated))
+            # A rebuild that counted before the invalidation must not store its result
+            for user_id in invalidated:
+                pipe.incr(_generation_key(user_id))
+                pipe.expire(_generation_key(user_id), settings.NOTIFICATION_UNREAD_TTL_SECONDS)
+        pipe.execute()
+    except redis.RedisError as e:
+        # Drift is corrected by the reconciler
+        logger.warning(f"Unread counter update failed: {e}")
+
+
+def reconcile(db: Session) -> int:
+    """
+    Recount every cached user from the database and overwrite counters
+    that drifted. Returns the number of counters corrected.
+    """
+    corrected = 0
+    user_ids = []
+    for key in redis_client.scan_iter(match=f"{KEY_PREFIX}*", count=RECONCILE_BATCH_SIZE):
+        user_ids.append(int(key[len(KEY_PREFIX):]))
+        if len(user_ids) >= RECONCILE_BATCH_SIZE:
+            corrected += _reconcile_users(db, user_ids)
+            user_ids = []
+    if user_ids:
+        corrected += _reconcile_users(db, user_ids)
+    return corrected
+
+
+def _reconcile_users(db: Session, user_ids: List[int]) -> int:
+    pipe = redis_client.pipeline(transaction=False)
+    for user_id in user_ids:
+        pipe.hgetall(_key(user_id))
+    cached = pipe.execute()
+    counts = count_unread(db, user_ids)
+    db.rollback()  # end the read transaction; nothing was written
+
+    pipe = redis_client.pipeline(transaction=False)
+    corrected = 0
+    for user_id, cached_counts in zip(user_ids, cached):
+        if not cached_counts:
+            continue  # expired since the scan
+        current = _empty_counts()
+        current.update({field: int(value) for field, value in cached_counts.items()})
+        if current != counts[user_id]:
+            _store(pipe, user_id, counts[user_id])
+            corrected += 1
+    pipe.execute()
+    return corrected
+
+
+# Track ORM notification writes and apply them to Redis after commit
+
+@event.listens_for(Session, "after_flush")
+def _collect_unread_changes(session, flush_context):
+    for obj in session.new:
+        if isinstance(obj, Notification) and not obj.is_read:
+            queue_change(session, obj.user_id, obj.category, 1)
+
+    for obj in session.dirty:
+        if not isinstance(obj, Notification):
+            continue
+        history = inspect(obj).attrs.is_read.history
+        if not history.has_changes():
+            continue
+        if not history.deleted:
+            # Previous value was never loaded, so the change is unknown
+            queue_invalidation(session, obj.user_id)
+        elif bool(history.deleted[0]) != bool(obj.is_read):
+            queue_change(session, obj.user_id, obj.category, -1 if obj.is_read else 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Notification) and not obj.is_read:
+            queue_change(session, obj.user_id, obj.category, -1)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session):
+    # Fired on savepoint release as well; only the outermost commit is final
+    if session.in_nested_transaction():
+        return
+    changes = session.info.pop(_PENDING_KEY, None)
+    invalidated = session.info.pop(_INVALIDATED_KEY, None)
+    if changes or invalidated:
+        _apply_changes(changes or {}, invalidated or ())
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    # A failed savepoint keeps changes from earlier flushes
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_INVALIDATED_KEY, None)
\ No newline at end of file
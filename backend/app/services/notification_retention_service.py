@@ -0,0 +1,149 @@
+"""
+Retention for read notifications
+
+Read notifications older than the retention window are deleted in bounded
+batches and written to a zstd-compressed JSON lines archive, one file per
+run under NOTIFICATION_ARCHIVE_DIR. Each batch locks at most batch_size
+rows (skipping rows locked by readers or writers) and commits on its own,
+so the job never holds long or wide locks on the table. Batches walk the
+table in id order from where the previous one stopped, so each starts at
+the next expired row instead of rescanning the ones already deleted;
+rows skipped because they were locked are picked up by the next run.
+
+A batch is written as a complete zstd frame and fsynced before its DELETE
+commits. A crash or failed commit after that leaves the frame in place
+even if the rows are still in the table; the next run archives them
+again, so the archive is at-least-once and readers should de-duplicate
+on id. Unread notifications are never removed, so the Redis unread
+counters are unaffected.
+
+Reported bytes are the deleted rows' on-disk tuple sizes (pg_column_size);
+the space becomes reusable after VACUUM.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import zstandard
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COMPRESSION_LEVEL = 10
+
+_DELETE_BATCH = text("""
+    WITH expired AS (
+        SELECT id FROM notifications
+        WHERE is_read = true AND created_at < :cutoff AND id > :after_id
+        ORDER BY id
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    DELETE FROM notifications n
+    USING expired
+    WHERE n.id = expired.id
+    RETURNING n.*, pg_column_size(n.*) AS row_bytes
+""")
+
+
+def archive_path(archive_dir: str, started_at: datetime) -> str:
+    """Archive file for a run started at started_at"""
+    return os.path.join(archive_dir, f"notifications-{started_at:%Y%m%dT%H%M%S}.jsonl.zst")
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int, archive, after_id: int = 0) -> Dict[str, int]:
+    """
+    Delete one batch of expired read notifications with ids above after_id
+    and write them to the open archive as one zstd frame, fsynced before
+    returning. last_id is the highest id deleted, to pass as the next
+    batch's after_id. The caller commits.
+    """
+    rows = db.execute(
+        _DELETE_BATCH, {"cutoff": cutoff, "batch_size": batch_size, "after_id": after_id}
+    ).mappings().all()
+    if not rows:
+        return {"archived": 0, "bytes": 0, "last_id": after_id}
+
+    reclaimed = 0
+    compressor = zstandard.ZstdCompressor(level=ARCHIVE_COMPRESSION_LEVEL)
+    writer = compressor.stream_writer(archive, closefd=False)
+    for row in rows:
+        record = dict(row)
+        reclaimed += record.pop("row_bytes")
+        writer.write(json.dumps(record, default=str).encode() + b"\n")
+    writer.flush(zstandard.FLUSH_FRAME)
+    archive.flush()
+    os.fsync(archive.fileno())
+    return {"archived": len(rows), "bytes": reclaimed, "last_id": max(row["id"] for row in rows)}
+
+
+def purge_read_notifications(
+    db: Session,
+    retention_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+    archive_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Archive and delete read notifications older than retention_days,
+    committing after every batch. Returns the number of rows archived, the
+    tuple bytes reclaimed and the archive file (None when nothing expired).
+    """
+    retention_days = retention_days or settings.NOTIFICATION_RETENTION_DAYS
+    batch_size = batch_size or settings.NOTIFICATION_RETENTION_BATCH_SIZE
+    archive_dir = archive_dir or settings.NOTIFICATION_ARCHIVE_DIR
+
+    started_at = datetime.utcnow()
+    cutoff = started_at - timedelta(days=retention_days)
+    path = archive_path(archive_dir, started_at)
+    os.makedirs(archive_dir, exist_ok=True)
+
+    archived = reclaimed = batches = last_id = 0
+    try:
+        with open(path, "ab") as archive:
+            while max_batches is None or batches < max_batches:
+                offset = archive.tell()
+                try:
+                    result = archive_batch(db, cutoff, batch_size, archive, after_id=last_id)
+                except Exception:
+                    db.rollback()
+                    # The batch's rows are still in the table; drop its frame
+                    archive.truncate(offset)
+                    raise
+                try:
+                    db.commit()
+                except Exception:
+                    # The commit may still have succeeded on the server, so
+                    # the frame is kept (and counted, so the file is not
+                    # removed); a repeat is de-duplicated on id
+                    db.rollback()
+                    archived += result["archived"]
+                    raise
+                batches += 1
+                last_id = result["last_id"]
+                archived += result["archived"]
+                reclaimed += result["bytes"]
+                if result["archived"] < batch_size:
+                    break
+    finally:
+        if not archived:
+            os.remove(path)
+
+    if not archived:
+        path = None
+    else:
+        logger.info(f"Archived {archived} notifications to {path}, {reclaimed} bytes reclaimed")
+
+    return {
+        "archived": archived,
+        "bytes_reclaimed": reclaimed,
+        "batches": batches,
+        "archive_path": path,
+        "cutoff": cutoff
+    }
\ No newline at end of file
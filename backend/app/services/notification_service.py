@@ -0,0 +1,396 @@
+"""
+Notification fan-out through a transactional outbox
+
+Callers record one NotificationOutbox row per announcement in their own
+transaction, so request latency does not depend on audience size. After
+commit the event is handed to a Celery worker, which resolves the audience
+with set-based SQL and writes recipients with INSERT ... SELECT in chunks of
+ascending user id. Each chunk commits together with the event's progress,
+so an interrupted delivery resumes where it stopped without duplicates.
+
+Committed notifications, whether fanned out here or added through the ORM,
+are published to the WebSocket hub after commit.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import distinct, event, insert, literal, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.exceptions import NotFoundError
+from app.core import notification_hub
+from app.services import notification_counter_service
+from app.models.notification import Notification, NotificationCategory, NotificationType
+from app.models.notification_outbox import NotificationAudience, NotificationOutbox, OutboxStatus
+from app.models.student_batch import StudentBatch, StudentBatchStatus
+from app.models.user import User, UserRole, UserStatus
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "notification_outbox_dispatch"
+_PUBLISH_KEY = "notification_publish"
+
+
+def push_message(
+    title: str,
+    message: str,
+    type: NotificationType,
+    category: NotificationCategory,
+    related_id: Optional[int],
+    created_at: datetime,
+    recipients: List[Tuple[int, int]]
+) -> Dict[str, Any]:
+    """Hub message for notifications sharing the same content"""
+    return {
+        "title": title,
+        "message": message,
+        "type": NotificationType(type).value,
+        "category": NotificationCategory(category).value,
+        "related_id": related_id,
+        "created_at": created_at.isoformat(),
+        "recipients": [list(recipient) for recipient in recipients]
+    }
+
+
+def to_push_data(notification: Notification) -> Dict[str, Any]:
+    """Client payload for one notification, as routed by the hub"""
+    data = push_message(
+        notification.title, notification.message, notification.type, notification.category,
+        notification.related_id, notification.created_at, []
+    )
+    del data["recipients"]
+    data["id"] = notification.id
+    return data
+
+
+def get_user_notification(db: Session, notification_id: int, user_id: int) -> Notification:
+    """Load one of the user's notifications"""
+    notification = db.query(Notification).filter(
+        Notification.id == notification_id,
+        Notification.user_id == user_id
+    ).first()
+    if notification is None:
+        raise NotFoundError(
+            f"Notification with ID {notification_id} not found",
+            details={"notification_id": notification_id}
+        )
+    return notification
+
+
+def mark_all_as_read(db: Session, user_id: int, category: Optional[NotificationCategory] = None) -> int:
+    """Mark every unread notification of a user as read, optionally one category only"""
+    query = db.query(Notification).filter(
+        Notification.user_id == user_id,
+        Notification.is_read == False  # noqa: E712
+    )
+    if category is not None:
+        query = query.filter(Notification.category == category)
+    now = datetime.utcnow()
+    updated = query.update({"is_read": True, "read_at": now, "updated_at": now}, synchronize_session=False)
+    # Bulk updates bypass the session events that maintain the counters
+    notification_counter_service.queue_invalidation(db, user_id)
+    return updated
+
+
+def get_feed(
+    db: Session,
+    user_id: int,
+    limit: int,
+    after: Optional[Tuple[datetime, int]] = None,
+    unread_only: bool = False,
+    category: Optional[NotificationCategory] = None
+) -> Tuple[List[Notification], Optional[Tuple[datetime, int]]]:
+    """
+    One page of a user's notifications, newest first, and the (created_at,
+    id) key to continue after, or None on the last page. Pages are read by
+    keyset from the (user_id, created_at, id) indexes, so every page costs
+    the same however deep it is.
+    """
+    query = db.query(Notification).filter(Notification.user_id == user_id)
+    if unread_only:
+        query = query.filter(Notification.is_read == False)  # noqa: E712
+    if category is not None:
+        query = query.filter(Notification.category == category)
+    if after is not None:
+        query = query.filter(tuple_(Notification.created_at, Notification.id) < tuple_(*after))
+
+    notifications = query.order_by(
+        Notification.created_at.desc(), Notification.id.desc()
+    ).limit(limit + 1).all()
+
+    if len(notifications) <= limit:
+        return notifications, None
+    notifications = notifications[:limit]
+    last = notifications[-1]
+    return notifications, (last.created_at, last.id)
+
+
+def get_missed_notifications(db: Session, user_id: int, last_id: int, limit: int) -> List[Notification]:
+    """Notifications created for a user after last_id, oldest first"""
+    return db.query(Notification).filter(
+        Notification.user_id == user_id,
+        Notification.id > last_id
+    ).order_by(Notification.id).limit(limit).all()
+
+
+def enqueue_notification(
+    db: Session,
+    audience: NotificationAudience,
+    title: str,
+    message: str,
+    category: NotificationCategory,
+    type: NotificationType = NotificationType.INFO,
+    audience_id: Optional[int] = None,
+    recipient_ids: Optional[Iterable[int]] = None,
+    audience_role: Optional[UserRole] = None,
+    related_id: Optional[int] = None
+) -> NotificationOutbox:
+    """
+    Record a notification for an audience in the caller's transaction.
+    Delivery starts once the transaction commits.
+    """
+    outbox = NotificationOutbox(
+        audience=audience,
+        audience_id=audience_id,
+        recipient_ids=sorted(set(recipient_ids)) if recipient_ids is not None else None,
+        audience_role=audience_role,
+        title=title,
+        message=message,
+        type=type,
+        category=category,
+        related_id=related_id
+    )
+    db.add(outbox)
+    return outbox
+
+
+def notify_batch(
+    db: Session,
+    batch_id: int,
+    message: str,
+    type: NotificationType = NotificationType.INFO
+) -> NotificationOutbox:
+    """Batch update for every active student of a batch (Notification.create_batch_notification)"""
+    return enqueue_notification(
+        db, NotificationAudience.BATCH, "Batch Update", message, NotificationCategory.BATCH,
+        type=type, audience_id=batch_id, related_id=batch_id
+    )
+
+
+def notify_center(
+    db: Session,
+    center_id: int,
+    title: str,
+    message: str,
+    category: NotificationCategory = NotificationCategory.SYSTEM,
+    type: NotificationType = NotificationType.INFO,
+    role: Optional[UserRole] = None
+) -> NotificationOutbox:
+    """Announcement to the active users of a center, optionally one role only"""
+    return enqueue_notification(
+        db, NotificationAudience.CENTER, title, message, category,
+        type=type, audience_id=center_id, audience_role=role
+    )
+
+
+def notify_attendance(
+    db: Session,
+    batch_id: int,
+    student_ids: Iterable[int],
+    message: str,
+    type: NotificationType = NotificationType.INFO
+) -> NotificationOutbox:
+    """Attendance update for several students (Notification.create_attendance_notification)"""
+    return enqueue_notification(
+        db, NotificationAudience.USERS, "Attendance Update", message, NotificationCategory.ATTENDANCE,
+        type=type, recipient_ids=student_ids, related_id=batch_id
+    )
+
+
+def notify_absent_students(
+    db: Session,
+    batch_id: int,
+    attendance_date: date,
+    student_ids: Iterable[int]
+) -> Optional[NotificationOutbox]:
+    """Absence notice for the students marked absent (Attendance.create_notification_for_absence)"""
+    student_ids = list(student_ids)
+    if not student_ids:
+        return None
+    return enqueue_notification(
+        db, NotificationAudience.USERS, "Attendance Marked", f"You were marked absent on {attendance_date}",
+        NotificationCategory.ATTENDANCE, type=NotificationType.WARNING,
+        recipient_ids=student_ids, related_id=batch_id
+    )
+
+
+def recipient_query(outbox: NotificationOutbox):
+    """SELECT of recipient user ids for an outbox event, as one column named user_id"""
+    if outbox.audience == NotificationAudience.USER:
+        return select(User.id.label("user_id")).where(User.id == outbox.audience_id)
+
+    if outbox.audience == NotificationAudience.USERS:
+        return select(User.id.label("user_id")).where(User.id.in_(outbox.recipient_ids or []))
+
+    if outbox.audience == NotificationAudience.BATCH:
+        return select(distinct(StudentBatch.student_id).label("user_id")).where(
+            StudentBatch.batch_id == outbox.audience_id,
+            StudentBatch.status == StudentBatchStatus.ACTIVE
+        )
+
+    query = select(User.id.label("user_id")).where(
+        User.center_id == outbox.audience_id,
+        User.status == UserStatus.ACTIVE
+    )
+    if outbox.audience_role is not None:
+        query = query.where(User.role == outbox.audience_role)
+    return query
+
+
+def deliver_chunk(db: Session, outbox_id: int, chunk_size: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Insert the next chunk of an event's notifications and advance its
+    progress. Returns (notification id, user id) pairs for the chunk, or
+    None when the event is finished or being delivered by another worker.
+    The caller commits.
+    """
+    outbox = db.query(NotificationOutbox).filter(
+        NotificationOutbox.id == outbox_id,
+        NotificationOutbox.status == OutboxStatus.PENDING
+    ).with_for_update(skip_locked=True).first()
+    if outbox is None:
+        return None
+
+    recipients = recipient_query(outbox).subquery()
+    chunk = select(recipients.c.user_id).where(
+        recipients.c.user_id > outbox.last_user_id
+    ).order_by(recipients.c.user_id).limit(chunk_size).subquery()
+
+    # Message fields are read from the outbox row itself so the enum
+    # columns keep their database types
+    created_at = datetime.utcnow()
+    rows = db.execute(
+        insert(Notification.__table__).from_select(
+            ["user_id", "title", "message", "type", "category", "related_id", "created_at", "updated_at"],
+            select(
+                chunk.c.user_id,
+                NotificationOutbox.title,
+                NotificationOutbox.message,
+                NotificationOutbox.type,
+                NotificationOutbox.category,
+                NotificationOutbox.related_id,
+                literal(created_at),
+                literal(created_at)
+            ).where(NotificationOutbox.id == outbox_id)
+        ).returning(Notification.__table__.c.id, Notification.__table__.c.user_id)
+    ).all()
+    delivered = [tuple(row) for row in rows]
+
+    if delivered:
+        outbox.last_user_id = max(user_id for _, user_id in delivered)
+        outbox.delivered_count += len(delivered)
+        db.info.setdefault(_PUBLISH_KEY, []).append(push_message(
+            outbox.title, outbox.message, outbox.type, outbox.category,
+            outbox.related_id, created_at, delivered
+        ))
+        for _, user_id in delivered:
+            notification_counter_service.queue_change(db, user_id, outbox.category, 1)
+    if len(delivered) < chunk_size:
+        outbox.status = OutboxStatus.COMPLETED
+        outbox.processed_at = datetime.utcnow()
+    return delivered
+
+
+def deliver(db: Session, outbox_id: int, chunk_size: Optional[int] = None) -> int:
+    """Deliver an event completely, committing after every chunk"""
+    chunk_size = chunk_size or settings.NOTIFICATION_FANOUT_CHUNK_SIZE
+    total = 0
+    while True:
+        delivered = deliver_chunk(db, outbox_id, chunk_size)
+        db.commit()
+        if delivered is None:
+            return total
+        total += len(delivered)
+
+
+def record_failure(db: Session, outbox_id: int, error: str):
+    """Count a failed delivery attempt, giving up after the configured maximum"""
+    outbox = db.query(NotificationOutbox).filter(
+        NotificationOutbox.id == outbox_id,
+        NotificationOutbox.status == OutboxStatus.PENDING
+    ).with_for_update().first()
+    if outbox is None:
+        return
+    outbox.attempts += 1
+    outbox.last_error = error
+    if outbox.attempts >= settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS:
+        outbox.status = OutboxStatus.FAILED
+        outbox.processed_at = datetime.utcnow()
+        logger.error(f"Notification outbox event {outbox_id} failed after {outbox.attempts} attempts: {error}")
+
+
+def get_stalled_events(db: Session, limit: int = 100) -> List[int]:
+    """Pending events that have not progressed within one poll interval"""
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.NOTIFICATION_OUTBOX_POLL_SECONDS)
+    return [
+        outbox_id for (outbox_id,) in db.query(NotificationOutbox.id).filter(
+            NotificationOutbox.status == OutboxStatus.PENDING,
+            NotificationOutbox.updated_at < cutoff
+        ).order_by(NotificationOutbox.id).limit(limit)
+    ]
+
+
+def _dispatch(outbox_ids: List[int]):
+    # Imported here: the task module imports this service
+    from app.tasks.notifications import deliver_notification
+
+    for outbox_id in outbox_ids:
+        try:
+            deliver_notification.delay(outbox_id)
+        except Exception as e:
+            # The outbox sweep picks the event up later
+            logger.warning(f"Notification dispatch failed for outbox event {outbox_id}: {e}")
+
+
+# Hand new events to the workers and publish new notifications only once
+# they are committed
+@event.listens_for(Session, "after_flush")
+def _collect_new_events(session, flush_context):
+    new_ids = [obj.id for obj in session.new if isinstance(obj, NotificationOutbox)]
+    if new_ids:
+        session.info.setdefault(_PENDING_KEY, []).extend(new_ids)
+
+    messages = [
+        push_message(
+            obj.title, obj.message, obj.type, obj.category,
+            obj.related_id, obj.created_at, [(obj.id, obj.user_id)]
+        )
+        for obj in session.new if isinstance(obj, Notification)
+    ]
+    if messages:
+        session.info.setdefault(_PUBLISH_KEY, []).extend(messages)
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_after_commit(session):
+    # A released savepoint fires this too; the outer transaction may still roll back
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        _dispatch(pending)
+
+    messages = session.info.pop(_PUBLISH_KEY, None)
+    if messages:
+        notification_hub.publish(messages)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    # A failed savepoint keeps events and messages from earlier flushes
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_PUBLISH_KEY, None)
\ No newline at end of file
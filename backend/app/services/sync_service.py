@@ -0,0 +1,257 @@
+"""
+Offline-first delta sync for attendance and batch topic progress
+
+Every attendance and batch_topics row carries sync_xid, the id of the
+transaction that last wrote it (set by a database trigger). A client's
+cursor is the xmin of a server snapshot: every transaction with a lower id
+had finished when the snapshot was taken, so pulling rows with
+sync_xid >= cursor never misses a commit that landed out of order. Rows
+written by transactions still running at that moment may be sent twice,
+which clients handle because records are upserted by key.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import AttendanceAlreadyMarkedError
+from app.core.user_cache import CachedUser
+from app.models.attendance import Attendance
+from app.models.batch import Batch
+from app.models.batch_topic import BatchTopic
+from app.models.student_batch import StudentBatch, StudentBatchStatus
+from app.models.user import UserRole
+from app.services.attendance_service import save_attendance
+
+SNAPSHOT_XMIN_SQL = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+
+def _to_server_time(value: datetime, clock_offset: timedelta) -> datetime:
+    """Convert a client timestamp to naive UTC on the server clock"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value + clock_offset
+
+
+def _result(entity: str, key: str, result: str, error: Optional[str] = None) -> Dict[str, Any]:
+    return {"entity": entity, "key": key, "result": result, "error": error}
+
+
+def get_syncable_batches(db: Session, current_user: CachedUser, batch_ids: List[int]) -> Dict[int, Batch]:
+    """Batches from batch_ids the user may sync, by id"""
+    batches = {}
+    for batch in db.query(Batch).filter(Batch.id.in_(batch_ids)):
+        if not current_user.can_access_center(batch.center_id):
+            continue
+        if current_user.role == UserRole.FACULTY and batch.faculty_id != current_user.id:
+            continue
+        batches[batch.id] = batch
+    return batches
+
+
+def apply_attendance_changes(
+    db: Session,
+    current_user: CachedUser,
+    batches: Dict[int, Batch],
+    changes: List[Any],
+    clock_offset: timedelta
+) -> List[Dict[str, Any]]:
+    """
+    Apply client attendance edits idempotently
+
+    Replaying a change leaves the row as is. An edit is rejected when the
+    existing record fails Attendance.can_be_modified, and reported as a
+    conflict (server wins) when the record changed on the server after the
+    client made its edit.
+    """
+    # Keep only the latest edit per record
+    latest = {}
+    for change in changes:
+        key = (change.student_id, change.batch_id, change.date)
+        if key not in latest or change.client_updated_at > latest[key].client_updated_at:
+            latest[key] = change
+
+    keys = [key for key in latest if key[1] in batches]
+    existing = {}
+    enrolled = set()
+    if keys:
+        existing = {
+            (record.student_id, record.batch_id, record.date): record
+            for record in db.query(Attendance).filter(
+                tuple_(Attendance.student_id, Attendance.batch_id, Attendance.date).in_(keys)
+            )
+        }
+        enrolled = {
+            (student_id, batch_id)
+            for student_id, batch_id in db.query(StudentBatch.student_id, StudentBatch.batch_id).filter(
+                tuple_(StudentBatch.student_id, StudentBatch.batch_id).in_({key[:2] for key in keys}),
+                StudentBatch.status == StudentBatchStatus.ACTIVE
+            )
+        }
+
+    results = []
+    for key, change in latest.items():
+        result_key = f"{change.student_id}:{change.batch_id}:{change.date}"
+        batch = batches.get(change.batch_id)
+        if batch is None:
+            results.append(_result("attendance", result_key, "rejected", "Batch is not accessible"))
+            continue
+
+        changed_at = _to_server_time(change.client_updated_at, clock_offset)
+        record = existing.get(key)
+
+        if record is None:
+            if key[:2] not in enrolled:
+                error = "Student is not actively enrolled in this batch"
+            elif change.date > date.today() or change.date < batch.start_date:
+                error = "Date is outside the batch schedule"
+            else:
+                error = None
+            if error:
+                results.append(_result("attendance", result_key, "rejected", error))
+                continue
+
+            attendance = Attendance(
+                student_id=change.student_id,
+                batch_id=change.batch_id,
+                faculty_id=current_user.id if current_user.is_faculty() else batch.faculty_id,
+                date=change.date,
+                status=change.status,
+                remarks=change.remarks,
+                topic_covered=change.topic_covered,
+                marked_at=changed_at
+            )
+            try:
+                save_attendance(db, attendance)
+            except AttendanceAlreadyMarkedError:
+                # Another device created the record since we looked
+                results.append(_result("attendance", result_key, "conflict", "Attendance was marked concurrently"))
+                continue
+            results.append(_result("attendance", result_key, "applied"))
+            continue
+
+        if (record.status, record.remarks, record.topic_covered) == (change.status, change.remarks, change.topic_covered):
+            results.append(_result("attendance", result_key, "unchanged"))
+        elif not record.can_be_modified(current_user.role, current_user.id):
+            results.append(_result("attendance", result_key, "rejected", "Attendance was marked by another faculty member"))
+        elif record.updated_at > changed_at:
+            results.append(_result("attendance", result_key, "conflict", "Record changed on the server after this edit"))
+        else:
+            record.status = change.status
+            record.remarks = change.remarks
+            record.topic_covered = change.topic_covered
+            record.marked_at = changed_at
+            results.append(_result("attendance", result_key, "applied"))
+
+    return results
+
+
+def apply_batch_topic_changes(
+    db: Session,
+    current_user: CachedUser,
+    batches: Dict[int, Batch],
+    changes: List[Any],
+    clock_offset: timedelta
+) -> List[Dict[str, Any]]:
+    """Apply client batch topic progress edits with the same rules as attendance"""
+    latest = {}
+    for change in changes:
+        if change.id not in latest or change.client_updated_at > latest[change.id].client_updated_at:
+            latest[change.id] = change
+
+    existing = {}
+    if latest:
+        existing = {
+            topic.id: topic
+            for topic in db.query(BatchTopic).filter(BatchTopic.id.in_(list(latest)))
+        }
+
+    results = []
+    for topic_id, change in latest.items():
+        topic = existing.get(topic_id)
+        if topic is None or topic.batch_id not in batches:
+            results.append(_result("batch_topic", str(topic_id), "rejected", "Batch topic is not accessible"))
+        elif (topic.status, topic.completed_date, topic.notes) == (change.status, change.completed_date, change.notes):
+            results.append(_result("batch_topic", str(topic_id), "unchanged"))
+        elif not topic.can_be_modified(current_user.role, current_user.id):
+            results.append(_result("batch_topic", str(topic_id), "rejected", "Topic is assigned to another faculty member"))
+        elif topic.updated_at > _to_server_time(change.client_updated_at, clock_offset):
+            results.append(_result("batch_topic", str(topic_id), "conflict", "Record changed on the server after this edit"))
+        else:
+            topic.status = change.status
+            topic.completed_date = change.completed_date
+            topic.notes = change.notes
+            results.append(_result("batch_topic", str(topic_id), "applied"))
+
+    return results
+
+
+def get_changes_since(
+    db: Session,
+    batch_ids: List[int],
+    since_version: Optional[int]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Attendance and batch topic rows in batch_ids written at or after since_version"""
+    attendance_query = db.query(Attendance).filter(Attendance.batch_id.in_(batch_ids))
+    topic_query = db.query(BatchTopic).filter(BatchTopic.batch_id.in_(batch_ids))
+    if since_version is not None:
+        attendance_query = attendance_query.filter(Attendance.sync_xid >= since_version)
+        topic_query = topic_query.filter(BatchTopic.sync_xid >= since_version)
+
+    return {
+        "attendance": [
+            {
+                "id": record.id,
+                "student_id": record.student_id,
+                "batch_id": record.batch_id,
+                "faculty_id": record.faculty_id,
+                "date": record.date,
+                "status": record.status,
+                "remarks": record.remarks,
+                "topic_covered": record.topic_covered,
+                "updated_at": record.updated_at
+            }
+            for record in attendance_query.order_by(Attendance.id)
+        ],
+        "batch_topics": [
+            {
+                "id": topic.id,
+                "batch_id": topic.batch_id,
+                "topic_id": topic.topic_id,
+                "faculty_id": topic.faculty_id,
+                "status": topic.status,
+                "scheduled_date": topic.scheduled_date,
+                "completed_date": topic.completed_date,
+                "notes": topic.notes,
+                "updated_at": topic.updated_at
+            }
+            for topic in topic_query.order_by(BatchTopic.id)
+        ]
+    }
+
+
+def synchronize(db: Session, current_user: CachedUser, request: Any) -> Dict[str, Any]:
+    """
+    Apply a client's pending changes, then return everything that changed
+    since its last sync together with the next cursor
+    """
+    server_now = datetime.utcnow()
+    clock_offset = server_now - _to_server_time(request.client_timestamp, timedelta(0))
+    batches = get_syncable_batches(db, current_user, request.batch_ids)
+
+    results = apply_attendance_changes(db, current_user, batches, request.attendance, clock_offset)
+    results += apply_batch_topic_changes(db, current_user, batches, request.batch_topics, clock_offset)
+    db.commit()
+
+    # Take the cursor before reading so nothing committed in between is skipped
+    server_version = db.execute(SNAPSHOT_XMIN_SQL).scalar()
+    changes = get_changes_since(db, list(batches), request.since_version)
+
+    return {
+        "server_version": server_version,
+        "server_timestamp": server_now,
+        "results": results,
+        **changes
+    }
@@ -0,0 +1,3 @@
+"""
+Celery tasks
+"""
\ No newline at end of file
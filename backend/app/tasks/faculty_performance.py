@@ -0,0 +1,85 @@
+"""
+Nightly FacultyPerformance generation
+
+generate_faculty_performance fans out one generate_center_performance task
+per active center, so centers are computed in parallel across workers. Each
+center task upserts its rows in one transaction and is then recorded in a
+per-run Redis set. Running the pipeline again for the same run only
+dispatches the centers still missing, so a failed night can be resumed.
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import Optional
+
+from celery import group
+from sqlalchemy.exc import OperationalError
+
+from app.celery_app import celery_app
+from app.database import SessionLocal, redis_client
+from app.models.center import Center, CenterStatus
+from app.services import faculty_performance_service
+
+logger = logging.getLogger(__name__)
+
+RUN_KEY_PREFIX = "faculty_performance:run:"
+RUN_KEY_TTL = 3 * 24 * 3600  # seconds
+
+
+def _run_key(evaluation_period: str, run_date: str) -> str:
+    return f"{RUN_KEY_PREFIX}{evaluation_period}:{run_date}"
+
+
+@celery_app.task(
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    max_retries=5
+)
+def generate_center_performance(center_id: int, evaluation_period: str, run_date: str) -> int:
+    """Generate one center's performance records for a period"""
+    run_key = _run_key(evaluation_period, run_date)
+    if redis_client.sismember(run_key, center_id):
+        return 0
+
+    db = SessionLocal()
+    try:
+        written = faculty_performance_service.generate_center_performance(db, center_id, evaluation_period)
+        db.commit()
+    finally:
+        db.close()
+
+    redis_client.sadd(run_key, center_id)
+    redis_client.expire(run_key, RUN_KEY_TTL)
+    logger.info(f"Generated {written} performance records for center {center_id}, period {evaluation_period}")
+    return written
+
+
+@celery_app.task
+def generate_faculty_performance(evaluation_period: Optional[str] = None, run_date: Optional[str] = None) -> int:
+    """
+    Dispatch per-center generation for a period, skipping centers already
+    finished in this run. Defaults to the month containing yesterday, so the
+    first run of a month finalizes the previous one.
+    """
+    evaluation_period = evaluation_period or f"{date.today() - timedelta(days=1):%Y-%m}"
+    run_date = run_date or date.today().isoformat()
+    done = redis_client.smembers(_run_key(evaluation_period, run_date))
+
+    db = SessionLocal()
+    try:
+        center_ids = [
+            center_id for (center_id,) in db.query(Center.id).filter(
+                Center.status == CenterStatus.ACTIVE
+            ).order_by(Center.id)
+            if str(center_id) not in done
+        ]
+    finally:
+        db.close()
+
+    if center_ids:
+        group(
+            generate_center_performance.s(center_id, evaluation_period, run_date)
+            for center_id in center_ids
+        ).apply_async()
+    logger.info(f"Dispatched performance generation for {len(center_ids)} centers, period {evaluation_period}")
+    return len(center_ids)
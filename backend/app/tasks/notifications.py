@@ -0,0 +1,77 @@
+"""
+Notification outbox delivery
+
+deliver_notification is dispatched after commit for every new outbox event.
+process_notification_outbox runs on a short beat interval and re-dispatches
+events that stopped progressing, e.g. because the broker was unreachable at
+commit time or a worker died mid-delivery. reconcile_unread_counters
+corrects drift in the Redis unread counters, and purge_read_notifications
+archives expired read notifications nightly.
+"""
+
+import logging
+
+from app.celery_app import celery_app
+from app.database import SessionLocal
+from app.services import notification_counter_service, notification_retention_service, notification_service
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task
+def deliver_notification(outbox_id: int) -> int:
+    """Expand one outbox event into per-user notifications"""
+    db = SessionLocal()
+    try:
+        delivered = notification_service.deliver(db, outbox_id)
+    except Exception as e:
+        db.rollback()
+        notification_service.record_failure(db, outbox_id, str(e))
+        db.commit()
+        logger.warning(f"Notification outbox event {outbox_id} delivery failed: {e}")
+        return 0
+    finally:
+        db.close()
+
+    if delivered:
+        logger.info(f"Delivered {delivered} notifications for outbox event {outbox_id}")
+    return delivered
+
+
+@celery_app.task
+def process_notification_outbox() -> int:
+    """Re-dispatch pending outbox events that have stalled"""
+    db = SessionLocal()
+    try:
+        outbox_ids = notification_service.get_stalled_events(db)
+    finally:
+        db.close()
+
+    for outbox_id in outbox_ids:
+        deliver_notification.delay(outbox_id)
+    return len(outbox_ids)
+
+
+@celery_app.task
+def reconcile_unread_counters() -> int:
+    """Recount cached unread counters from the database"""
+    db = SessionLocal()
+    try:
+        corrected = notification_counter_service.reconcile(db)
+    finally:
+        db.close()
+
+    if corrected:
+        logger.info(f"Corrected {corrected} unread notification counters")
+    return corrected
+
+
+@celery_app.task
+def purge_read_notifications() -> int:
+    """Archive and delete read notifications past the retention window"""
+    db = SessionLocal()
+    try:
+        result = notification_retention_service.purge_read_notifications(db)
+    finally:
+        db.close()
+    return result["archived"]
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Archive and delete read notifications past the retention window
+
+Runs nightly from Celery beat; this script runs the same job by hand:
+
+    python scripts/archive_notifications.py
+    python scripts/archive_notifications.py --retention-days 30 --batch-size 1000 --max-batches 10
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services import notification_retention_service
+
+
+def main(args):
+    db = SessionLocal()
+    try:
+        result = notification_retention_service.purge_read_notifications(
+            db,
+            retention_days=args.retention_days,
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+            archive_dir=args.archive_dir
+        )
+    finally:
+        db.close()
+
+    print(f"Archived {result['archived']} notifications read before {result['cutoff']:%Y-%m-%d %H:%M}")
+    print(f"Reclaimed {result['bytes_reclaimed']} bytes in {result['batches']} batches")
+    if result["archive_path"]:
+        print(f"Archive: {result['archive_path']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--retention-days", type=int, default=settings.NOTIFICATION_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.NOTIFICATION_RETENTION_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, help="stop after this many batches")
+    parser.add_argument("--archive-dir", default=settings.NOTIFICATION_ARCHIVE_DIR)
+    main(parser.parse_args())
@@ -0,0 +1,80 @@
+"""
+Benchmark sync (get_db) vs asyncio (get_async_db) request handling
+
+Runs two equivalent endpoints in-process against the configured Postgres
+database and reports requests per second for each path:
+
+    python scripts/benchmark_db_sessions.py --requests 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import async_engine, engine, get_async_db, get_db
+from app.models import User
+
+
+def build_app() -> FastAPI:
+    """Build a minimal app exposing the same lookup on both paths"""
+    app = FastAPI()
+
+    @app.get("/sync/users/{user_id}")
+    def sync_user(user_id: int, db: Session = Depends(get_db)):
+        user = db.query(User).filter(User.id == user_id).first()
+        return {"id": user.id if user else None}
+
+    @app.get("/async/users/{user_id}")
+    async def async_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        return {"id": user.id if user else None}
+
+    return app
+
+
+async def run(client: httpx.AsyncClient, path: str, total: int, concurrency: int) -> float:
+    """Issue `total` requests with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+async def main(args):
+    app = build_app()
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, path in (("sync", "/sync/users/"), ("async", "/async/users/")):
+            # Warm up the pool before measuring
+            await run(client, f"{path}{args.user_id}", args.concurrency, args.concurrency)
+            rps = await run(client, f"{path}{args.user_id}", args.requests, args.concurrency)
+            print(f"{label:>5}: {rps:,.0f} req/s ({args.requests} requests, concurrency {args.concurrency})")
+
+    engine.dispose()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--user-id", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
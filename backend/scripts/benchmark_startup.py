@@ -0,0 +1,53 @@
+"""
+Benchmark application startup with create_all vs the Alembic revision check
+
+Runs the database step of the FastAPI lifespan startup repeatedly against
+the configured database in each mode and reports the boot time per worker:
+
+    python scripts/benchmark_startup.py --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.database import engine
+from app.main import prepare_database
+
+
+def time_startup(runs: int) -> list:
+    """Time `runs` schema startups with a fresh connection pool each time"""
+    timings = []
+    for _ in range(runs):
+        # Each new worker starts with an empty pool
+        engine.dispose()
+        start = time.perf_counter()
+        prepare_database()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main(args):
+    modes = (
+        ("create_all", {"DB_CREATE_ALL_ON_STARTUP": True, "DB_VERIFY_REVISION_ON_STARTUP": False}),
+        ("revision check", {"DB_CREATE_ALL_ON_STARTUP": False, "DB_VERIFY_REVISION_ON_STARTUP": True}),
+    )
+    for label, overrides in modes:
+        for key, value in overrides.items():
+            setattr(settings, key, value)
+        timings = time_startup(args.runs)
+        print(
+            f"{label:>14}: mean {statistics.mean(timings) * 1000:.1f} ms, "
+            f"median {statistics.median(timings) * 1000:.1f} ms over {args.runs} runs"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,52 @@
+"""
+Create upcoming attendance partitions and archive expired ones
+
+Meant to run daily from cron or the task scheduler:
+
+    python scripts/maintain_attendance_partitions.py
+    python scripts/maintain_attendance_partitions.py --months-ahead 6 --retention-months 24 --drop
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services import attendance_partition_service
+
+
+def main(args):
+    db = SessionLocal()
+    try:
+        created = attendance_partition_service.ensure_future_partitions(db, args.months_ahead)
+        db.commit()
+        print(f"Created partitions: {', '.join(created) or 'none'}")
+
+        if args.retention_months:
+            archive_schema = None if args.drop else settings.ATTENDANCE_ARCHIVE_SCHEMA
+            detached = attendance_partition_service.detach_old_partitions(
+                db, args.retention_months, archive_schema
+            )
+            db.commit()
+            action = "Dropped" if args.drop else f"Archived to {archive_schema}"
+            print(f"{action}: {', '.join(detached) or 'none'}")
+
+        stranded = attendance_partition_service.count_default_rows(db)
+        if stranded:
+            print(f"Warning: {stranded} rows are in the default partition")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--months-ahead", type=int, default=settings.ATTENDANCE_PARTITION_MONTHS_AHEAD)
+    parser.add_argument(
+        "--retention-months", type=int, default=settings.ATTENDANCE_RETENTION_MONTHS,
+        help="detach partitions older than this many months; 0 keeps everything"
+    )
+    parser.add_argument("--drop", action="store_true", help="drop expired partitions instead of archiving")
+    main(parser.parse_args())
@@ -0,0 +1,33 @@
+"""
+Rebuild the Redis attendance bitmaps from the attendance table
+
+Run after restoring Redis, after bulk attendance imports, or whenever the
+bitmaps may have drifted:
+
+    python scripts/rebuild_attendance_bitmaps.py
+    python scripts/rebuild_attendance_bitmaps.py --batch-id 12 --batch-id 13
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services import attendance_bitmap_service
+
+
+def main(args):
+    db = SessionLocal()
+    try:
+        pairs = attendance_bitmap_service.rebuild(db, args.batch_id)
+    finally:
+        db.close()
+    print(f"Rebuilt attendance bitmaps for {pairs} student/batch pairs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-id", type=int, action="append", help="limit to these batches")
+    main(parser.parse_args())
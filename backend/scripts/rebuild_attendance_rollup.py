@@ -0,0 +1,49 @@
+"""
+Backfill or rebuild attendance_daily_rollup from the attendance table
+
+Each month is rebuilt in its own transaction so attendance writes are only
+blocked briefly:
+
+    python scripts/rebuild_attendance_rollup.py --start 2024-01-01 --end 2024-12-31
+    python scripts/rebuild_attendance_rollup.py --start 2024-06-01 --end 2024-06-30 --batch-id 12
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services import attendance_rollup_service
+
+
+def month_ranges(start: date, end: date):
+    """Split [start, end] into calendar month chunks"""
+    while start <= end:
+        next_month = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        yield start, min(end, next_month - timedelta(days=1))
+        start = next_month
+
+
+def main(args):
+    total = 0
+    for chunk in month_ranges(args.start, args.end):
+        db = SessionLocal()
+        try:
+            rows = attendance_rollup_service.rebuild(db, chunk, args.batch_id)
+            db.commit()
+        finally:
+            db.close()
+        total += rows
+        print(f"{chunk[0]} - {chunk[1]}: {rows} rollup rows")
+    print(f"Rebuilt {total} rollup rows")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--start", type=date.fromisoformat, required=True)
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--batch-id", type=int, action="append", help="limit to these batches")
+    main(parser.parse_args())
@@ -0,0 +1,3 @@
+"""
+Tests for the Student Academics Management System backend
+"""
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+EXPLAIN-based checks that the planner uses the attendance indexes
+
+Requires a disposable Postgres database in TEST_DATABASE_URL; the schema is
+migrated to head with Alembic, seeded with ~120k attendance rows across
+three monthly partitions, and dropped again afterwards. Indexes used on a
+partition are reported under the name of the parent index.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set"
+)
+
+SEED_SQL = [
+    "INSERT INTO centers (id, name, code, created_at, updated_at) VALUES (1, 'Center', 'C1', now(), now())",
+    "INSERT INTO subjects (id, name, code, duration_hours, created_at, updated_at) "
+    "VALUES (1, 'Subject', 'S1', 40, now(), now())",
+    # users 1-50 are faculty, 51-2050 are students
+    "INSERT INTO users (id, email, password_hash, first_name, last_name, role, created_at, updated_at) "
+    "SELECT g, 'user' || g || '@example.com', 'x', 'First', 'Last', "
+    "CASE WHEN g <= 50 THEN 'FACULTY' ELSE 'STUDENT' END::userrole, now(), now() "
+    "FROM generate_series(1, 2050) g",
+    "INSERT INTO faculty (user_id, employee_id, joining_date, id, created_at, updated_at) "
+    "SELECT g, 'EMP' || g, DATE '2024-01-01', g, now(), now() FROM generate_series(1, 50) g",
+    "INSERT INTO students (user_id, enrollment_number, enrollment_date, id, created_at, updated_at) "
+    "SELECT g, 'ENR' || g, DATE '2024-01-01', g, now(), now() FROM generate_series(51, 2050) g",
+    # 100 batches of 20 students, two batches per faculty member
+    "INSERT INTO batches (id, name, subject_id, faculty_id, center_id, start_date, max_students, created_at, updated_at) "
+    "SELECT b, 'Batch ' || b, 1, 1 + b % 50, 1, DATE '2024-01-01', 30, now(), now() "
+    "FROM generate_series(1, 100) b",
+    # Monthly partitions for the seeded class days
+    *(
+        f"CREATE TABLE IF NOT EXISTS attendance_p2024_{month:02d} PARTITION OF attendance "
+        f"FOR VALUES FROM ('2024-{month:02d}-01') TO ('2024-{month + 1:02d}-01')"
+        for month in (1, 2, 3)
+    ),
+    # 60 class days per batch
+    "INSERT INTO attendance (student_id, batch_id, faculty_id, date, status, created_at, updated_at) "
+    "SELECT 51 + (b - 1) * 20 + s, b, 1 + b % 50, DATE '2024-01-01' + d, "
+    "(ARRAY['PRESENT', 'ABSENT', 'LATE', 'EXCUSED'])[1 + (s + d) % 4]::attendancestatus, now(), now() "
+    "FROM generate_series(1, 100) b, generate_series(0, 19) s, generate_series(0, 59) d",
+    "ANALYZE",
+]
+
+
+def run_alembic(*args):
+    subprocess.run(
+        [sys.executable, "-m", "alembic", *args],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": TEST_DATABASE_URL},
+        check=True
+    )
+
+
+@pytest.fixture(scope="module")
+def connection():
+    run_alembic("upgrade", "head")
+    engine = create_engine(TEST_DATABASE_URL)
+    with engine.connect() as connection:
+        for statement in SEED_SQL:
+            connection.execute(text(statement))
+        connection.commit()
+        yield connection
+    engine.dispose()
+    run_alembic("downgrade", "base")
+
+
+def plan_nodes(connection, query: str) -> list:
+    """Flatten the JSON query plan into a list of nodes"""
+    plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {query}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    nodes, pending = [], [plan[0]["Plan"]]
+    while pending:
+        node = pending.pop()
+        nodes.append(node)
+        pending.extend(node.get("Plans", []))
+    return nodes
+
+
+def used_indexes(connection, query: str) -> set:
+    """Collect the attendance indexes used by the plan, by their parent index name"""
+    parents = dict(connection.execute(text(
+        "SELECT c.relname, p.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE c.relkind = 'i'"
+    )).all())
+    return {
+        parents.get(node["Index Name"], node["Index Name"])
+        for node in plan_nodes(connection, query)
+        if "Index Name" in node
+    }
+
+
+def scanned_tables(connection, query: str) -> set:
+    """Collect the tables (partitions) the plan reads"""
+    return {node["Relation Name"] for node in plan_nodes(connection, query) if "Relation Name" in node}
+
+
+def test_batch_date_lookup_uses_index(connection):
+    query = "SELECT * FROM attendance WHERE batch_id = 7 AND date = DATE '2024-01-15'"
+    assert "ix_attendance_batch_id_date" in used_indexes(connection, query)
+
+
+def test_batch_date_range_uses_index(connection):
+    query = (
+        "SELECT count(*) FROM attendance WHERE batch_id = 7 "
+        "AND date BETWEEN DATE '2024-01-01' AND DATE '2024-01-07'"
+    )
+    assert "ix_attendance_batch_id_date" in used_indexes(connection, query)
+
+
+def test_student_batch_lookup_uses_unique_index(connection):
+    query = "SELECT * FROM attendance WHERE student_id = 200 AND batch_id = 8"
+    assert "uq_attendance_student_batch_date" in used_indexes(connection, query)
+
+
+def test_faculty_date_lookup_uses_index(connection):
+    query = "SELECT * FROM attendance WHERE faculty_id = 8 AND date = DATE '2024-01-15'"
+    assert "ix_attendance_faculty_id_date" in used_indexes(connection, query)
+
+
+def test_recent_window_prunes_partitions(connection):
+    query = (
+        "SELECT count(*) FROM attendance WHERE batch_id = 7 "
+        "AND date BETWEEN DATE '2024-02-05' AND DATE '2024-02-11'"
+    )
+    assert scanned_tables(connection, query) == {"attendance_p2024_02"}
+
+
+def test_duplicate_marking_is_rejected(connection):
+    with pytest.raises(IntegrityError, match=r"Key \(student_id, batch_id, date\)"):
+        connection.execute(text(
+            "INSERT INTO attendance (student_id, batch_id, faculty_id, date, status, created_at, updated_at) "
+            "VALUES (51, 1, 2, DATE '2024-01-01', 'PRESENT', now(), now())"
+        ))
+    connection.rollback()
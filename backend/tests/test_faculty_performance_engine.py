@@ -0,0 +1,79 @@
+"""
+Parity checks between the batch performance engine and the per-row
+FacultyPerformance methods
+
+The per-row methods are called unbound on plain stand-in objects, so the
+checks do not depend on configuring the ORM mappers.
+"""
+
+import random
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.models.faculty_performance import FacultyPerformance
+from app.services import faculty_performance_service as engine
+
+
+def random_metric(scale: float, boundaries: tuple):
+    """A Numeric-like metric value, biased towards grading boundaries"""
+    choice = random.random()
+    if choice < 0.1:
+        return None
+    if choice < 0.4:
+        return Decimal(str(random.choice(boundaries)))
+    return Decimal(f"{random.uniform(0, scale):.2f}")
+
+
+@pytest.fixture(scope="module")
+def performances():
+    random.seed(20231001)
+    return [
+        SimpleNamespace(
+            faculty_id=index,
+            evaluation_period="2023-10",
+            overall_score=None,
+            average_completion_rate=random_metric(100, (60, 80, 59.99, 80.01)),
+            average_feedback_rating=random_metric(5, (3.0, 4.0, 2.99, 4.01)),
+            attendance_percentage=random_metric(100, (85, 90, 84.99)),
+            punctuality_score=random_metric(100, (85, 90, 89.99)),
+            syllabus_coverage_percentage=random_metric(100, (80, 90, 79.99))
+        )
+        for index in range(5000)
+    ]
+
+
+@pytest.fixture(scope="module")
+def metrics(performances):
+    return engine.metric_matrix([
+        tuple(getattr(performance, name) for name in engine.METRIC_COLUMNS)
+        for performance in performances
+    ])
+
+
+def test_overall_scores_match(performances, metrics):
+    expected = [FacultyPerformance.calculate_overall_score(performance) for performance in performances]
+    assert engine.calculate_overall_scores(metrics) == expected
+
+
+def test_grades_and_levels_match(performances, metrics):
+    scores = np.array(engine.calculate_overall_scores(metrics))
+    for performance in performances:
+        FacultyPerformance.calculate_overall_score(performance)
+    assert engine.get_performance_grades(scores) == [
+        FacultyPerformance.get_performance_grade(p) for p in performances
+    ]
+    assert engine.get_performance_levels(scores) == [
+        FacultyPerformance.get_performance_level(p) for p in performances
+    ]
+
+
+def test_strengths_and_improvement_areas_match(performances, metrics):
+    assert engine.get_strengths(metrics) == [
+        FacultyPerformance.get_strengths(p) for p in performances
+    ]
+    assert engine.get_improvement_areas(metrics) == [
+        FacultyPerformance.get_improvement_areas(p) for p in performances
+    ]
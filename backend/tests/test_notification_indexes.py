@@ -0,0 +1,120 @@
+"""
+EXPLAIN-based checks that the notification feed reads by keyset
+
+Requires a disposable Postgres database in TEST_DATABASE_URL; the schema is
+migrated to head with Alembic, seeded with 200k notifications for 200
+users, and dropped again afterwards.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine, text
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set"
+)
+
+SEED_SQL = [
+    "INSERT INTO users (id, email, password_hash, first_name, last_name, role, created_at, updated_at) "
+    "SELECT g, 'user' || g || '@example.com', 'x', 'First', 'Last', 'STUDENT'::userrole, now(), now() "
+    "FROM generate_series(1, 200) g",
+    # 1000 notifications per user, one in ten unread; fan-out chunks share created_at
+    "INSERT INTO notifications (user_id, title, message, type, category, is_read, created_at, updated_at) "
+    "SELECT u, 'Title', 'Message', 'INFO'::notificationtype, 'BATCH'::notificationcategory, n % 10 <> 0, "
+    "TIMESTAMP '2024-01-01' + (n / 2) * INTERVAL '1 hour', now() "
+    "FROM generate_series(1, 200) u, generate_series(1, 1000) n",
+    "ANALYZE",
+]
+
+FEED_INDEX = "ix_notifications_user_id_created_at_id"
+UNREAD_INDEX = "ix_notifications_unread_user_id_created_at_id"
+
+
+def run_alembic(*args):
+    subprocess.run(
+        [sys.executable, "-m", "alembic", *args],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": TEST_DATABASE_URL},
+        check=True
+    )
+
+
+@pytest.fixture(scope="module")
+def connection():
+    run_alembic("upgrade", "head")
+    engine = create_engine(TEST_DATABASE_URL)
+    with engine.connect() as connection:
+        for statement in SEED_SQL:
+            connection.execute(text(statement))
+        connection.commit()
+        yield connection
+    engine.dispose()
+    run_alembic("downgrade", "base")
+
+
+def plan(connection, query: str) -> dict:
+    """Root node of the JSON query plan"""
+    result = connection.execute(text(f"EXPLAIN (FORMAT JSON) {query}")).scalar()
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]["Plan"]
+
+
+def plan_nodes(connection, query: str) -> list:
+    """Flatten the JSON query plan into a list of nodes"""
+    nodes, pending = [], [plan(connection, query)]
+    while pending:
+        node = pending.pop()
+        nodes.append(node)
+        pending.extend(node.get("Plans", []))
+    return nodes
+
+
+def used_indexes(connection, query: str) -> set:
+    return {node["Index Name"] for node in plan_nodes(connection, query) if "Index Name" in node}
+
+
+def is_sorted(connection, query: str) -> bool:
+    return any(node["Node Type"] in ("Sort", "Incremental Sort") for node in plan_nodes(connection, query))
+
+
+def feed_query(after: str = "", unread_only: bool = False) -> str:
+    conditions = ["user_id = 42"]
+    if unread_only:
+        conditions.append("is_read = false")
+    if after:
+        conditions.append(f"(created_at, id) < ({after})")
+    return (
+        f"SELECT * FROM notifications WHERE {' AND '.join(conditions)} "
+        "ORDER BY created_at DESC, id DESC LIMIT 21"
+    )
+
+
+def test_first_page_reads_feed_index_in_order(connection):
+    query = feed_query()
+    assert FEED_INDEX in used_indexes(connection, query)
+    assert not is_sorted(connection, query)
+
+
+def test_deep_page_costs_the_same_as_first_page(connection):
+    query = feed_query(after="TIMESTAMP '2024-01-03', 1000000")
+    assert FEED_INDEX in used_indexes(connection, query)
+    assert plan(connection, query)["Total Cost"] <= plan(connection, feed_query())["Total Cost"] * 1.5
+
+
+def test_unread_feed_uses_partial_index(connection):
+    query = feed_query(unread_only=True, after="TIMESTAMP '2024-01-10', 1000000")
+    assert UNREAD_INDEX in used_indexes(connection, query)
+    assert not is_sorted(connection, query)
+
+
+def test_unread_count_uses_partial_index(connection):
+    query = "SELECT category, count(*) FROM notifications WHERE user_id = 42 AND is_read = false GROUP BY category"
+    assert UNREAD_INDEX in used_indexes(connection, query)
\ No newline at end of file
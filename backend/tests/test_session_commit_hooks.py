@@ -0,0 +1,196 @@
+"""
+Session hooks that publish derived data to Redis must wait for the
+outermost commit: releasing a savepoint fires after_commit too, and the
+enclosing transaction can still roll back.
+
+The hooks run against an in-memory SQLite session with the Redis writes
+replaced by recorders, so no database or Redis server is needed.
+"""
+
+import asyncio
+import threading
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core import user_cache as user_cache_module
+from app.models.attendance import AttendanceStatus
+from app.models.notification import NotificationCategory
+from app.services import (
+    attendance_bitmap_service,
+    faculty_ranking_service,
+    notification_counter_service,
+    notification_service
+)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    with Session(engine) as session:
+        session.connection()
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def bitmap_updates(monkeypatch):
+    applied = []
+    monkeypatch.setattr(attendance_bitmap_service, "_apply_updates", applied.append)
+    return applied
+
+
+def queue_bitmap_update(session):
+    attendance_bitmap_service.queue_update(
+        session, 1, 2, date(2023, 10, 1), date(2023, 10, 3), AttendanceStatus.PRESENT
+    )
+
+
+def test_bitmap_updates_dropped_when_outer_transaction_rolls_back(session, bitmap_updates):
+    with session.begin_nested():
+        queue_bitmap_update(session)
+    assert bitmap_updates == []
+
+    session.rollback()
+    assert bitmap_updates == []
+
+
+def test_bitmap_updates_applied_on_outer_commit(session, bitmap_updates):
+    with session.begin_nested():
+        queue_bitmap_update(session)
+    session.commit()
+    assert bitmap_updates == [{(1, 2, 2): AttendanceStatus.PRESENT}]
+
+
+
+@pytest.fixture
+def user_invalidations(monkeypatch):
+    invalidated = []
+    monkeypatch.setattr(
+        user_cache_module.user_cache, "invalidate", lambda *user_ids: invalidated.append(set(user_ids))
+    )
+    return invalidated
+
+
+def test_user_cache_kept_when_outer_transaction_rolls_back(session, user_invalidations):
+    with session.begin_nested():
+        session.info.setdefault(user_cache_module._PENDING_KEY, set()).add(7)
+    assert user_invalidations == []
+
+    session.rollback()
+    assert user_invalidations == []
+
+
+def test_user_cache_invalidated_on_outer_commit(session, user_invalidations):
+    with session.begin_nested():
+        session.info.setdefault(user_cache_module._PENDING_KEY, set()).add(7)
+    session.commit()
+    assert user_invalidations == [{7}]
+
+
+def test_user_cache_invalidation_leaves_event_loop(monkeypatch):
+    deleted = []
+    monkeypatch.setattr(
+        user_cache_module.redis_client, "delete", lambda *keys: deleted.append((threading.get_ident(), keys))
+    )
+
+    async def invalidate():
+        user_cache_module.user_cache.invalidate(7)
+        return threading.get_ident()
+
+    # asyncio.run waits for the default executor before returning
+    loop_thread = asyncio.run(invalidate())
+    assert [keys for _, keys in deleted] == [("auth:user:7",)]
+    assert deleted[0][0] != loop_thread
+
+
+
+@pytest.fixture
+def notification_deliveries(monkeypatch):
+    delivered = []
+    monkeypatch.setattr(notification_service, "_dispatch", lambda pending: delivered.append(("dispatch", pending)))
+    monkeypatch.setattr(
+        notification_service.notification_hub, "publish", lambda messages: delivered.append(("publish", messages))
+    )
+    return delivered
+
+
+def queue_notification(session):
+    session.info.setdefault(notification_service._PENDING_KEY, []).append(11)
+    session.info.setdefault(notification_service._PUBLISH_KEY, []).append("message")
+
+
+def test_notifications_held_when_outer_transaction_rolls_back(session, notification_deliveries):
+    with session.begin_nested():
+        queue_notification(session)
+    assert notification_deliveries == []
+
+    session.rollback()
+    assert notification_deliveries == []
+
+
+def test_notifications_sent_on_outer_commit(session, notification_deliveries):
+    with session.begin_nested():
+        queue_notification(session)
+    session.commit()
+    assert notification_deliveries == [("dispatch", [11]), ("publish", ["message"])]
+
+
+
+@pytest.fixture
+def counter_changes(monkeypatch):
+    applied = []
+    monkeypatch.setattr(
+        notification_counter_service, "_apply_changes", lambda changes, invalidated: applied.append(dict(changes))
+    )
+    return applied
+
+
+def queue_counter_change(session):
+    category = next(iter(NotificationCategory))
+    notification_counter_service.queue_change(session, 5, category, 1)
+    return category
+
+
+def test_unread_counters_kept_when_outer_transaction_rolls_back(session, counter_changes):
+    with session.begin_nested():
+        queue_counter_change(session)
+    assert counter_changes == []
+
+    session.rollback()
+    assert counter_changes == []
+
+
+def test_unread_counters_updated_on_outer_commit(session, counter_changes):
+    with session.begin_nested():
+        category = queue_counter_change(session)
+    session.commit()
+    assert counter_changes == [{(5, category.value): 1}]
+
+
+
+@pytest.fixture
+def ranking_invalidations(monkeypatch):
+    invalidated = []
+    monkeypatch.setattr(
+        faculty_ranking_service.period_scores, "invalidate", lambda *periods: invalidated.append(set(periods))
+    )
+    return invalidated
+
+
+def test_rankings_kept_when_outer_transaction_rolls_back(session, ranking_invalidations):
+    with session.begin_nested():
+        faculty_ranking_service.queue_invalidation(session, "2023-10")
+    assert ranking_invalidations == []
+
+    session.rollback()
+    assert ranking_invalidations == []
+
+
+def test_rankings_invalidated_on_outer_commit(session, ranking_invalidations):
+    with session.begin_nested():
+        faculty_ranking_service.queue_invalidation(session, "2023-10")
+    session.commit()
+    assert ranking_invalidations == [{"2023-10"}]